@@ -24,6 +24,8 @@ setup(
         "webpack_loader",
         "webpack_loader/templatetags",
         "webpack_loader/contrib",
+        "webpack_loader/management",
+        "webpack_loader/management/commands",
     ],
     version=VERSION,
     license="MIT License",
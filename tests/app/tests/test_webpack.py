@@ -1,21 +1,34 @@
+import asyncio
 import json
 import os
+import re
 import time
+from io import StringIO
 from shutil import rmtree
+from tempfile import mkdtemp
 from subprocess import call
 from threading import Thread
+from unittest import skipIf, skipUnless
 from unittest.mock import patch
 from unittest.mock import call as MockCall
 
+import django
 from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.core.management import call_command
+from django.http import HttpResponse
 from django.template import Context, Template, engines
 from django.template.response import TemplateResponse
 from django.test.client import RequestFactory
 from django.test.testcases import TestCase
+from django.utils import timezone
 from django.views.generic.base import TemplateView
 from django_jinja.backend import Jinja2
 from django_jinja.backend import Template as Jinja2Template
 from django_jinja.builtins import DEFAULT_EXTENSIONS
+from jinja2 import Environment as JinjaEnvironment
+from jinja2 import TemplateSyntaxError
 
 from webpack_loader.exceptions import (
     WebpackBundleLookupError,
@@ -23,8 +36,18 @@ from webpack_loader.exceptions import (
     WebpackLoaderBadStatsError,
     WebpackLoaderTimeoutError,
 )
+from webpack_loader import signals, utils
+from webpack_loader.config import _compile_ignores
+from webpack_loader.loaders import WebpackLoader
 from webpack_loader.templatetags.webpack_loader import _WARNING_MESSAGE
-from webpack_loader.utils import get_as_tags, get_loader, get_as_url_to_tag_dict
+from webpack_loader.utils import (
+    get_as_tags,
+    get_as_url_to_tag_dict,
+    get_files,
+    get_loader,
+    preload,
+)
+from webpack_loader.watchers import InotifyStatsWatcher, PollingStatsWatcher
 
 BUNDLE_PATH = os.path.join(
     settings.BASE_DIR, 'assets/django_webpack_loader_bundles/')
@@ -32,6 +55,47 @@ DEFAULT_CONFIG = 'DEFAULT'
 _OUR_EXTENSION = 'webpack_loader.contrib.jinja2ext.WebpackExtension'
 
 
+def _main_stats():
+    'Return new stats of a build whose main bundle is main.js.'
+    return {
+        'status': 'done',
+        'chunks': {'main': ['main.js']},
+        'assets': {'main.js': {'name': 'main.js'}},
+    }
+
+
+class MemoryStorage(Storage):
+    'A storage keeping its files in memory, like a remote one would.'
+
+    def __init__(self):
+        self._files = {}
+
+    def _open(self, name, mode='rb'):
+        if name not in self._files:
+            raise FileNotFoundError(name)
+        return ContentFile(self._files[name][0], name=name)
+
+    def _save(self, name, content):
+        data = content.read()
+        if isinstance(data, str):
+            data = data.encode()
+        self._files[name] = (data, timezone.now())
+        return name
+
+    def delete(self, name):
+        self._files.pop(name, None)
+
+    def exists(self, name):
+        return name in self._files
+
+    def size(self, name):
+        return len(self._open(name).read())
+
+    def get_modified_time(self, name):
+        self._open(name)
+        return self._files[name][1]
+
+
 class LoaderTestCase(TestCase):
     def setUp(self):
         self.factory = RequestFactory()
@@ -64,6 +128,63 @@ class LoaderTestCase(TestCase):
             expected_errors = []
             self.assertEqual(errors, expected_errors)
 
+    def test_stats_check(self):
+        from webpack_loader.apps import webpack_stats_check
+
+        loader = get_loader(DEFAULT_CONFIG)
+        statsfile = self._write_stats_file({'status': 'compile'})
+        self.assertEqual(webpack_stats_check(None), [])
+
+        with patch.dict(loader.config, {'PRELOAD': True}):
+            errors = webpack_stats_check(None)
+            self.assertEqual(
+                [e.id for e in errors], ['django-webpack-loader.E003'])
+
+            os.remove(statsfile)
+            errors = webpack_stats_check(None)
+            self.assertEqual(
+                [e.id for e in errors], ['django-webpack-loader.E002'])
+
+            self._write_stats_file({'status': 'done', 'chunks': {}, 'assets': {}})
+            self.assertEqual(webpack_stats_check(None), [])
+
+    def test_preload_stats(self):
+        self._write_stats_file({'status': 'done', 'chunks': {}, 'assets': {
+            'logo-1a2b.png': {
+                'name': 'logo-1a2b.png', 'sourceFilename': 'logo.png'}}})
+        # Other test modules reload utils, which empties its loader cache
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        self.assertEqual(preload([DEFAULT_CONFIG]), {})
+        assets = loader.get_assets()
+        self.assertIn(
+            'source_filenames', loader.get_assets_cache(assets))
+
+        os.remove(settings.WEBPACK_LOADER[DEFAULT_CONFIG]['STATS_FILE'])
+        errors = preload([DEFAULT_CONFIG])
+        self.assertIsInstance(errors[DEFAULT_CONFIG], IOError)
+
+    def test_preload_before_fork(self):
+        import gc
+        import webpack_loader
+
+        self._write_stats_file({'status': 'done', 'chunks': {}, 'assets': {
+            'main.js': {'name': 'main.js'}}})
+        # The stats file of APP2 is used by other tests, point it elsewhere
+        app2_loader = utils.get_loader('APP2')
+        missing_stats_file = os.path.join(mkdtemp(), 'webpack-stats.json')
+        self.addCleanup(os.rmdir, os.path.dirname(missing_stats_file))
+        self.addCleanup(gc.unfreeze)
+        with patch.dict(app2_loader.config, {'STATS_FILE': missing_stats_file}):
+            report = webpack_loader.preload([DEFAULT_CONFIG, 'APP2'])
+        self.assertEqual(list(report.errors), ['APP2'])
+        self.assertGreater(report.shared_bytes, 0)
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+        # An empty list preloads nothing rather than every configuration
+        self.assertEqual(
+            webpack_loader.preload([], freeze=False),
+            utils.PreloadReport(errors={}, shared_bytes=0))
+
     def test_simple_and_css_extract(self):
         self.compile_bundles('webpack.config.simple.js')
         assets = get_loader(DEFAULT_CONFIG).get_assets()
@@ -438,6 +559,1150 @@ class LoaderTestCase(TestCase):
             with self.assertRaises(WebpackLoaderTimeoutError):
                 loader.get_bundle('main')
 
+    def _write_stats_file(self, stats, config=DEFAULT_CONFIG):
+        statsfile = settings.WEBPACK_LOADER[config]['STATS_FILE']
+        with open(statsfile + '.tmp', 'w') as fd:
+            fd.write(json.dumps(stats))
+        os.replace(statsfile + '.tmp', statsfile)
+        return statsfile
+
+    def test_stats_file_parsed_once_while_unchanged(self):
+        self._write_stats_file({'status': 'done', 'chunks': {}, 'assets': {}})
+        loader = get_loader(DEFAULT_CONFIG)
+        assets = loader.get_assets()
+        with patch('webpack_loader.loaders.json.loads') as loads_mock:
+            self.assertIs(loader.get_assets(), assets)
+            loads_mock.assert_not_called()
+
+        self._write_stats_file({'status': 'compile'})
+        self.assertEqual(loader.get_assets(), {'status': 'compile'})
+
+    def test_stats_content_hash_skips_identical_rewrite(self):
+        loader = get_loader(DEFAULT_CONFIG)
+        with patch.dict(loader.config, {'STATS_CONTENT_HASH': True}):
+            statsfile = self._write_stats_file(
+                {'status': 'done', 'chunks': {}, 'assets': {}})
+            assets = loader.get_assets()
+            stat = os.stat(statsfile)
+            os.utime(statsfile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            with patch('webpack_loader.loaders.json.loads') as loads_mock:
+                self.assertIs(loader.get_assets(), assets)
+                loads_mock.assert_not_called()
+
+    def test_stats_check_interval(self):
+        self._write_stats_file({'status': 'done', 'chunks': {}, 'assets': {}})
+        loader = get_loader(DEFAULT_CONFIG)
+        loader.get_assets()
+        with patch.dict(loader.config, {'STATS_CHECK_INTERVAL': 60}):
+            self._write_stats_file({'status': 'compile'})
+            self.assertEqual(loader.get_assets()['status'], 'done')
+
+            with patch('webpack_loader.loaders.time.monotonic',
+                       return_value=time.monotonic() + 60):
+                self.assertEqual(loader.get_assets()['status'], 'compile')
+
+    def _write_partial_stats_file(self, stats, config=DEFAULT_CONFIG):
+        statsfile = settings.WEBPACK_LOADER[config]['STATS_FILE']
+        with open(statsfile, 'w') as fd:
+            fd.write(json.dumps(stats)[:-10])
+        return statsfile
+
+    def test_partial_stats_file_uses_last_good_stats(self):
+        self._write_stats_file({'status': 'done', 'chunks': {}, 'assets': {}})
+        loader = get_loader(DEFAULT_CONFIG)
+        assets = loader.get_assets()
+
+        self._write_partial_stats_file({'status': 'compile', 'chunks': {}})
+        with self.assertWarns(RuntimeWarning):
+            self.assertIs(loader.get_assets(), assets)
+
+        self._write_stats_file({'status': 'compile'})
+        self.assertEqual(loader.get_assets(), {'status': 'compile'})
+
+    def test_partial_stats_file_is_read_again(self):
+        loader = get_loader(DEFAULT_CONFIG)
+        loader._stats_file_cache = None
+        self._write_partial_stats_file({'status': 'done', 'chunks': {}})
+
+        def finish_writing(delay):
+            self._write_stats_file({'status': 'done', 'chunks': {}})
+
+        with patch('webpack_loader.loaders.time.sleep',
+                   side_effect=finish_writing) as sleep_mock:
+            self.assertEqual(
+                loader.get_assets(), {'status': 'done', 'chunks': {}})
+        sleep_mock.assert_called_once()
+
+        self._write_partial_stats_file({'status': 'done', 'chunks': {}})
+        loader._stats_file_cache = None
+        with patch('webpack_loader.loaders.time.sleep') as sleep_mock:
+            self.assertRaises(ValueError, loader.get_assets)
+        self.assertEqual(sleep_mock.call_count, 3)
+
+    def test_stats_file_parsed_once_by_concurrent_requests(self):
+        self._write_stats_file({'status': 'done', 'chunks': {}, 'assets': {}})
+        loader = get_loader(DEFAULT_CONFIG)
+        loader.get_assets()
+        self._write_stats_file({'status': 'compile'})
+
+        parse_stats = loader._parse_stats
+        with patch.object(loader, '_parse_stats', side_effect=lambda *args: (
+                time.sleep(0.1), parse_stats(*args))[1]) as parse_mock:
+            threads = [
+                Thread(target=loader.get_assets) for _ in range(10)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        parse_mock.assert_called_once()
+        self.assertEqual(loader.get_assets(), {'status': 'compile'})
+
+    def test_error_stats_are_not_modified(self):
+        stats = {'status': 'error', 'message': 'Module not found'}
+        self._write_stats_file(stats)
+        loader = get_loader(DEFAULT_CONFIG)
+        with self.assertRaises(WebpackError) as cm:
+            loader.get_bundle('main')
+        self.assertIn('Unknown Error in', str(cm.exception))
+        self.assertEqual(loader.get_assets(), stats)
+
+    def _assert_watcher_wakes_compile_wait(self, loader):
+        self._write_stats_file({'status': 'compile'})
+        done_stats = _main_stats()
+        t = Thread(target=lambda: (
+            time.sleep(0.5), self._write_stats_file(done_stats)))
+        then = time.time()
+        t.start()
+        chunks = list(loader.get_bundle('main'))
+        t.join()
+        self.assertLess(time.time() - then, 5)
+        self.assertEqual(chunks[0]['name'], 'main.js')
+
+    @skipUnless(InotifyStatsWatcher.is_available(), 'inotify is not available')
+    def test_watch_stats_file_wakes_compile_wait(self):
+        loader = get_loader(DEFAULT_CONFIG)
+        with self.settings(DEBUG=True), patch.dict(loader.config, {
+                'WATCH_STATS_FILE': True, 'POLL_INTERVAL': 10,
+                'TIMEOUT': 30}):
+            self.assertIsInstance(loader.get_stats_watcher(), InotifyStatsWatcher)
+            self._assert_watcher_wakes_compile_wait(loader)
+
+    def test_watch_stats_file_polling_fallback(self):
+        loader = get_loader(DEFAULT_CONFIG)
+        with self.settings(DEBUG=True), patch.dict(loader.config, {
+                'WATCH_STATS_FILE': True, 'POLL_INTERVAL': 0.05,
+                'TIMEOUT': 30}), \
+                patch.object(InotifyStatsWatcher, 'is_available', return_value=False), \
+                patch.object(loader, '_stats_watcher', None):
+            watcher = loader.get_stats_watcher()
+            self.assertIs(type(watcher), PollingStatsWatcher)
+            self._assert_watcher_wakes_compile_wait(loader)
+
+    def test_compile_wait_is_shared_between_requests(self):
+        self._write_stats_file({'status': 'compile'})
+        done_stats = _main_stats()
+        loader = get_loader(DEFAULT_CONFIG)
+        results = []
+        requests = [
+            Thread(target=lambda: results.append(list(loader.get_bundle('main'))))
+            for _ in range(20)]
+        with self.settings(DEBUG=True), patch.dict(loader.config, {
+                'POLL_INTERVAL': 0.05, 'TIMEOUT': 30}), \
+                patch.object(loader, 'get_assets', wraps=loader.get_assets) as get_assets:
+            for t in requests:
+                t.start()
+            time.sleep(0.5)
+            self._write_stats_file(done_stats)
+            for t in requests:
+                t.join()
+
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(r[0]['name'] == 'main.js' for r in results))
+        # Requests read the stats before and after waiting, while compiling
+        # only the shared poller reads the stats file
+        self.assertLess(get_assets.call_count, 2 * 20 + 0.5 / 0.05 + 10)
+
+    def test_compile_wait_timeout_is_shared(self):
+        self._write_stats_file({'status': 'compile'})
+        loader = get_loader(DEFAULT_CONFIG)
+        errors = []
+
+        def request():
+            try:
+                loader.get_bundle('main')
+            except WebpackLoaderTimeoutError as e:
+                errors.append(e)
+
+        with self.settings(DEBUG=True), patch.dict(loader.config, {
+                'POLL_INTERVAL': 0.05, 'TIMEOUT': 0.5}):
+            then = time.time()
+            first = Thread(target=request)
+            first.start()
+            time.sleep(0.3)
+            second = Thread(target=request)
+            second.start()
+            first.join()
+            second.join()
+            elapsed = time.time() - then
+
+        self.assertEqual(len(errors), 2)
+        self.assertLess(elapsed, 0.8 + 0.3)
+
+    async def test_async_get_files_and_tags(self):
+        stats = {
+            'status': 'done',
+            'chunks': {'main': ['main.css', 'main.js']},
+            'assets': {
+                'main.css': {'name': 'main.css'},
+                'main.js': {'name': 'main.js'},
+            },
+        }
+        self._write_stats_file(stats)
+        self.assertEqual(
+            await utils.aget_files('main', extension='js'),
+            utils.get_files('main', extension='js'))
+        self.assertEqual(
+            await utils.aget_as_tags('main', attrs='defer'),
+            utils.get_as_tags('main', attrs='defer'))
+
+        self._write_stats_file({'status': 'error', 'message': 'Failed'})
+        with self.assertRaises(WebpackError):
+            await utils.aget_files('main')
+
+    async def test_async_compile_wait_does_not_block_event_loop(self):
+        self._write_stats_file({'status': 'compile'})
+        done_stats = _main_stats()
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        with self.settings(DEBUG=True), patch.dict(loader.config, {
+                'POLL_INTERVAL': 0.05, 'TIMEOUT': 5}):
+            ticker = asyncio.ensure_future(tick())
+            requests = asyncio.gather(*(
+                utils.aget_files('main') for _ in range(5)))
+            await asyncio.sleep(0.5)
+            self.assertFalse(requests.done())
+            self._write_stats_file(done_stats)
+            results = await requests
+            ticker.cancel()
+
+        self.assertEqual([files[0]['name'] for files in results], ['main.js'] * 5)
+        self.assertGreater(ticks, 25)
+
+    async def test_async_compile_wait_timeout(self):
+        self._write_stats_file({'status': 'compile'})
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        with self.settings(DEBUG=True), patch.dict(loader.config, {
+                'POLL_INTERVAL': 0.05, 'TIMEOUT': 0.2}):
+            with self.assertRaises(WebpackLoaderTimeoutError):
+                await loader.aget_bundle('main')
+
+    async def test_async_jinja2_extension(self):
+        self._write_stats_file({
+            'status': 'done',
+            'chunks': {
+                'app1': ['vendors.js', 'app1.js'],
+                'app2': ['vendors.js', 'app2.js'],
+            },
+            'assets': {
+                'vendors.js': {'name': 'vendors.js'},
+                'app1.js': {'name': 'app1.js'},
+                'app2.js': {'name': 'app2.js'},
+            },
+        })
+        environment = JinjaEnvironment(
+            enable_async=True, extensions=[_OUR_EXTENSION])
+        template = environment.from_string(
+            "{{ render_bundle('app1') }}"
+            "{{ render_bundle('app2', skip_common_chunks=True) }}"
+            "{% for f in webpack_get_files('app2') %}{{ f.name }}{% endfor %}")
+        request = self.factory.get(path='/')
+        with patch('webpack_loader.loaders.WebpackLoader.get_bundle') as get_bundle:
+            output = await template.render_async(request=request)
+            get_bundle.assert_not_called()
+
+        self.assertEqual(output.count('vendors.js'), 2)
+        self.assertEqual(output.count('app2.js'), 2)
+        self.assertTrue(output.endswith('vendors.jsapp2.js'))
+
+    def test_signals(self):
+        stats = {
+            'status': 'done',
+            'chunks': {'main': ['main.css', 'main.js']},
+            'assets': {
+                'main.css': {'name': 'main.css'},
+                'main.js': {'name': 'main.js'},
+            },
+        }
+        self._write_stats_file(stats)
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        sent = []
+
+        def receiver(signal, sender, **kwargs):
+            self.assertIs(sender, type(loader))
+            self.assertIs(kwargs.pop('loader'), loader)
+            self.assertEqual(kwargs.pop('config'), DEFAULT_CONFIG)
+            self.assertGreaterEqual(kwargs.pop('duration') or 0, 0)
+            sent.append((signal, kwargs))
+
+        for signal in (
+                signals.stats_loaded, signals.bundle_resolved,
+                signals.bundle_rendered, signals.compile_wait):
+            signal.connect(receiver)
+            self.addCleanup(signal.disconnect, receiver)
+
+        utils.get_as_url_to_tag_dict('main', extension='js')
+        self.assertIn((signals.stats_loaded, {
+            'cache_hit': False, 'size': os.path.getsize(
+                settings.WEBPACK_LOADER[DEFAULT_CONFIG]['STATS_FILE']),
+            'chunk_count': 1, 'asset_count': 2,
+        }), sent)
+        self.assertIn((signals.bundle_resolved, {
+            'bundle_name': 'main', 'chunk_count': 2}), sent)
+        self.assertEqual(sent[-1], (signals.bundle_rendered, {
+            'bundle_name': 'main', 'extension': 'js', 'chunk_count': 1,
+            'cache_hit': False}))
+
+        del sent[:]
+        Template(
+            "{% load render_bundle from webpack_loader %}"
+            "{% render_bundle 'main' %}").render(Context())
+        self.assertIn((signals.stats_loaded, {
+            'cache_hit': True, 'size': None, 'chunk_count': 1,
+            'asset_count': 2}), sent)
+        self.assertNotIn(False, [
+            kwargs['cache_hit'] for signal, kwargs in sent
+            if signal is signals.stats_loaded])
+        self.assertEqual(sent[-1], (signals.bundle_rendered, {
+            'bundle_name': 'main', 'extension': None, 'chunk_count': 2,
+            'cache_hit': False}))
+
+        del sent[:]
+        self._write_stats_file({'status': 'compile'})
+        with self.settings(DEBUG=True), patch.dict(loader.config, {
+                'POLL_INTERVAL': 0.05, 'TIMEOUT': 30}):
+            Thread(target=lambda: (
+                time.sleep(0.2), self._write_stats_file(stats))).start()
+            utils.get_files('main')
+        self.assertIn((signals.compile_wait, {
+            'bundle_name': 'main', 'timed_out': False}), sent)
+
+    def test_metrics(self):
+        from webpack_loader import metrics
+
+        self._write_stats_file(_main_stats())
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        metrics.enable()
+        self.addCleanup(metrics.disable)
+        metrics.registry.clear()
+        self.addCleanup(metrics.registry.clear)
+
+        utils.get_as_tags('main')
+        self.assertEqual(metrics.tag_cache.get(config=DEFAULT_CONFIG, result='hit'), 0)
+        with patch.dict(loader.config, {'METRICS': True}):
+            utils.get_as_tags('main')
+            utils.get_as_tags('main')
+            self.assertRaises(
+                WebpackBundleLookupError, utils.get_as_tags, 'missing')
+            self._write_stats_file({
+                'status': 'done',
+                'chunks': {'main': ['main.js']},
+                'assets': {'main.js': {'name': 'main.js', 'integrity': ''}},
+            })
+            utils.get_as_tags('main')
+
+        self.assertEqual(metrics.tag_cache.get(config=DEFAULT_CONFIG, result='hit'), 2)
+        self.assertEqual(metrics.tag_cache.get(config=DEFAULT_CONFIG, result='miss'), 1)
+        self.assertEqual(metrics.lookup_errors.get(config=DEFAULT_CONFIG), 1)
+        self.assertEqual(metrics.stats_load_seconds.get_count(config=DEFAULT_CONFIG), 1)
+        self.assertGreater(metrics.stats_loads.get(config=DEFAULT_CONFIG, result='hit'), 0)
+
+        response = metrics.metrics_view(self.factory.get('/metrics'))
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        content = response.content.decode()
+        self.assertIn('# TYPE webpack_loader_tag_cache_total counter\n', content)
+        self.assertIn(
+            'webpack_loader_tag_cache_total{config="DEFAULT",result="miss"} 1\n',
+            content)
+        self.assertIn(
+            'webpack_loader_stats_load_seconds_bucket{config="DEFAULT",le="+Inf"} 1\n',
+            content)
+        self.assertIn(
+            'webpack_loader_stats_load_seconds_count{config="DEFAULT"} 1\n',
+            content)
+
+    def test_tags_compiled_once_per_stats_version(self):
+        stats = {
+            'status': 'done',
+            'chunks': {'main': ['main.css', 'main.js']},
+            'assets': {
+                'main.css': {'name': 'main.css'},
+                'main.js': {'name': 'main.js'},
+            },
+        }
+        self._write_stats_file(stats)
+        loader = get_loader(DEFAULT_CONFIG)
+        tags = get_as_url_to_tag_dict('main', extension='js')
+        with patch.object(loader, 'get_bundle') as get_bundle:
+            self.assertEqual(get_as_url_to_tag_dict('main', extension='js'), tags)
+            get_bundle.assert_not_called()
+
+        stats['chunks']['main'].append('vendors.js')
+        stats['assets']['vendors.js'] = {'name': 'vendors.js'}
+        self._write_stats_file(stats)
+        self.assertEqual(
+            list(get_as_url_to_tag_dict('main', extension='js')), [
+                '/static/django_webpack_loader_bundles/main.js',
+                '/static/django_webpack_loader_bundles/vendors.js',
+            ])
+
+    def test_tags_cache_is_bounded(self):
+        self._write_stats_file(_main_stats())
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        with patch.object(utils, '_TAGS_CACHE_SIZE', 3):
+            for i in range(10):
+                utils.get_as_tags('main', attrs='data-id="{0}"'.format(i))
+            utils.get_as_tags('main', attrs='data-id="7"')
+            utils.get_as_tags('main', attrs='data-id="10"')
+        tags_cache = loader.get_assets_cache(loader.get_assets())['tags']
+        # The least recently used variants are dropped
+        self.assertEqual(
+            [key[4] for key in tags_cache],
+            ['data-id="9"', 'data-id="7"', 'data-id="10"'])
+
+    def test_compiled_tags_splice_per_request_nonce(self):
+        self._write_stats_file(_main_stats())
+        loader = get_loader(DEFAULT_CONFIG)
+        url = '/static/django_webpack_loader_bundles/main.js'
+        with patch.dict(loader.config, {'CSP_NONCE': True}):
+            for nonce in ('first-nonce', 'second-nonce'):
+                request = self.factory.get('/')
+                request.csp_nonce = nonce
+                tags = get_as_url_to_tag_dict(
+                    'main', request=request, attrs='async')
+                self.assertEqual(tags[url], (
+                    '<script src="{0}" nonce="{1}" async></script>'
+                ).format(url, nonce))
+
+    def test_render_bundle_literal_arguments_resolved_once(self):
+        stats = {
+            'status': 'done',
+            'chunks': {'main': ['main.css', 'main.js']},
+            'assets': {
+                'main.css': {'name': 'main.css'},
+                'main.js': {'name': 'main.js'},
+            },
+        }
+        self._write_stats_file(stats)
+        template = Template(
+            "{% load render_bundle from webpack_loader %}"
+            "{% render_bundle 'main' 'js' attrs='async' is_preload=False %}"
+            "{% render_bundle 'main' skip_common_chunks=True %}"
+            "{% render_bundle bundle 'css' %}")
+        self.assertIsNotNone(template.nodelist[1].fragment)
+        self.assertIsNone(template.nodelist[3].fragment)
+        js_tag = (
+            '<script src="/static/django_webpack_loader_bundles/main.js" '
+            'async></script>')
+        css_tag = (
+            '<link href="/static/django_webpack_loader_bundles/main.css" '
+            'rel="stylesheet" />')
+
+        request = self.factory.get('/')
+        output = template.render(Context({'bundle': 'main', 'request': request}))
+        self.assertEqual(output, js_tag + css_tag + css_tag)
+
+        with patch('webpack_loader.utils._get_compiled_tags',
+                   wraps=utils._get_compiled_tags) as compiled_mock:
+            request = self.factory.get('/')
+            output = template.render(
+                Context({'bundle': 'main', 'request': request}))
+            self.assertEqual(output, js_tag + css_tag + css_tag)
+            # Only the tag with a variable argument looks the tags up
+            compiled_mock.assert_called_once()
+            self.assertEqual(request._webpack_loader_used_urls, {
+                '/static/django_webpack_loader_bundles/main.js',
+                '/static/django_webpack_loader_bundles/main.css'})
+
+            stats['assets']['main.js']['publicPath'] = 'https://cdn/main.js'
+            self._write_stats_file(stats)
+            output = template.render(Context({'bundle': 'main'}))
+            self.assertIn('<script src="https://cdn/main.js" async>', output)
+
+    def test_render_bundle_literal_arguments_with_nonce(self):
+        self._write_stats_file(_main_stats())
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        template = Template(
+            "{% load render_bundle from webpack_loader %}"
+            "{% render_bundle 'main' 'js' as tags %}{{ tags }}")
+        with patch.dict(loader.config, {'CSP_NONCE': True}):
+            for nonce in ('first-nonce', 'second-nonce'):
+                request = self.factory.get('/')
+                request.csp_nonce = nonce
+                output = template.render(Context({'request': request}))
+                self.assertEqual(output, (
+                    '<script src="/static/django_webpack_loader_bundles/'
+                    'main.js" nonce="{0}" ></script>').format(nonce))
+
+    def test_jinja2_render_bundle_tag(self):
+        self._write_stats_file({
+            'status': 'done',
+            'chunks': {
+                'app1': ['vendors.js', 'app1.js'],
+                'app2': ['vendors.js', 'app2.js'],
+            },
+            'assets': {
+                'vendors.js': {'name': 'vendors.js'},
+                'app1.js': {'name': 'app1.js'},
+                'app2.js': {'name': 'app2.js'},
+            },
+        })
+        environment = JinjaEnvironment(
+            autoescape=True, extensions=[_OUR_EXTENSION])
+        template = environment.from_string(
+            "{% render_bundle 'app1', 'js', attrs='defer' %}|"
+            "{% render_bundle name, skip_common_chunks=true %}")
+        vendors_tag = (
+            '<script src="/static/django_webpack_loader_bundles/vendors.js" '
+            'defer></script>')
+
+        request = self.factory.get('/')
+        output = template.render(name='app2', request=request)
+        self.assertEqual(output.count('vendors.js'), 1)
+        self.assertTrue(output.startswith(vendors_tag))
+        self.assertIn('app2.js', output)
+
+        with patch('webpack_loader.utils._get_compiled_tags',
+                   wraps=utils._get_compiled_tags) as compiled_mock:
+            output = template.render(name='app2', request=self.factory.get('/'))
+            # Only the tag with a variable argument looks the tags up
+            compiled_mock.assert_called_once()
+        self.assertTrue(output.startswith(vendors_tag))
+
+    def test_jinja2_render_bundle_tag_requires_commas(self):
+        environment = JinjaEnvironment(extensions=[_OUR_EXTENSION])
+        with self.assertRaises(TemplateSyntaxError):
+            environment.from_string("{% render_bundle 'app1' extension %}")
+        with self.assertRaises(TemplateSyntaxError):
+            environment.from_string(
+                "{% render_bundle 'app1' skip_common_chunks=true %}")
+
+    def test_chunk_urls_cached_per_stats_version(self):
+        self._write_stats_file({
+            'status': 'done',
+            'chunks': {'main': ['main.css', 'main.js']},
+            'assets': {
+                'main.css': {'name': 'main.css'},
+                'main.js': {'name': 'main.js'},
+            },
+        })
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        with patch.object(loader, 'get_chunk_url',
+                          wraps=loader.get_chunk_url) as get_chunk_url:
+            files = utils.get_files('main')
+            self.assertEqual(utils.get_files('main'), files)
+            self.assertEqual(get_chunk_url.call_count, 2)
+
+            with self.settings(STATIC_URL='/assets/'):
+                self.assertEqual(
+                    utils.get_files('main', extension='js')[0]['url'],
+                    '/assets/django_webpack_loader_bundles/main.js')
+                self.assertEqual(
+                    utils.get_as_tags('main', extension='js'),
+                    ['<script src="/assets/django_webpack_loader_bundles/'
+                     'main.js" ></script>'])
+
+    def test_chunk_urls_not_cached(self):
+        self._write_stats_file(_main_stats())
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        signatures = iter(range(100))
+
+        def get_chunk_url(chunk_file):
+            return '/signed/{0}?signature={1}'.format(
+                chunk_file['name'], next(signatures))
+
+        template = Template(
+            "{% load render_bundle from webpack_loader %}"
+            "{% render_bundle 'main' %}")
+        with patch.dict(loader.config, {'CACHE_CHUNK_URLS': False}), \
+                patch.object(loader, 'get_chunk_url', get_chunk_url):
+            self.assertEqual(
+                utils.get_files('main')[0]['url'],
+                '/signed/main.js?signature=0')
+            self.assertEqual(
+                utils.get_as_tags('main'),
+                ['<script src="/signed/main.js?signature=1" ></script>'])
+            self.assertEqual(
+                template.render(Context()),
+                '<script src="/signed/main.js?signature=2" ></script>')
+            self.assertEqual(
+                template.render(Context()),
+                '<script src="/signed/main.js?signature=3" ></script>')
+
+    def test_ignore_patterns_combined(self):
+        ignore_re = _compile_ignores([r'.+\.hot-update.js', r'.+\.map'])
+        self.assertTrue(ignore_re.match('main.1a2b.hot-update.js'))
+        self.assertTrue(ignore_re.match('main.js.map'))
+        self.assertFalse(ignore_re.match('main.js'))
+        self.assertIsNone(_compile_ignores([]))
+        # Patterns that can't be combined are matched one by one
+        self.assertIsNone(_compile_ignores([r'(.)\1\.js', r'.+\.map']))
+        self.assertIsNone(_compile_ignores([r'.+\.map', r'(?i).+\.LOG']))
+        self.assertIsNone(_compile_ignores([r'(?i).+\.LOG', r'.+\.map']))
+
+    def test_ignore_patterns_with_mixed_flags(self):
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        ignores = [r'.+\.map', r'(?i).+\.LOG']
+        with patch.dict(loader.config, {
+                'ignores': [re.compile(p) for p in ignores],
+                'ignore_re': _compile_ignores(ignores)}):
+            # (?i) only applies to the second pattern
+            self.assertEqual(
+                loader.filter_chunks(['APP.MAP', 'app.map', 'app.log', 'app.js']),
+                ['APP.MAP', 'app.js'])
+
+    def test_filtered_chunks_cached_per_stats_version(self):
+        stats = {
+            'status': 'done',
+            'chunks': {'main': [
+                'main.js', 'main.js.map', 'main.1a2b.hot-update.js']},
+            'assets': {
+                'main.js': {'name': 'main.js'},
+                'main.js.map': {'name': 'main.js.map'},
+                'main.1a2b.hot-update.js': {'name': 'main.1a2b.hot-update.js'},
+            },
+        }
+        self._write_stats_file(stats)
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        with patch.object(loader, 'filter_chunks',
+                          wraps=loader.filter_chunks) as filter_chunks:
+            for _ in range(2):
+                self.assertEqual(
+                    [chunk['name'] for chunk in utils.get_files('main')],
+                    ['main.js'])
+            filter_chunks.assert_called_once()
+
+            stats['chunks']['main'].append('vendors.js')
+            stats['assets']['vendors.js'] = {'name': 'vendors.js'}
+            self._write_stats_file(stats)
+            self.assertEqual(
+                [chunk['name'] for chunk in utils.get_files('main')],
+                ['main.js', 'vendors.js'])
+            self.assertEqual(filter_chunks.call_count, 2)
+
+    def test_get_as_tags_many(self):
+        self._write_stats_file({
+            'status': 'done',
+            'chunks': {
+                'vendor': ['vendor.css', 'vendor.js'],
+                'main': ['vendor.js', 'main.css', 'main.js'],
+            },
+            'assets': {
+                'vendor.css': {'name': 'vendor.css'},
+                'vendor.js': {'name': 'vendor.js'},
+                'main.css': {'name': 'main.css'},
+                'main.js': {'name': 'main.js'},
+            },
+        })
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        prefix = '/static/django_webpack_loader_bundles/'
+        with patch.object(loader, 'get_assets',
+                          wraps=loader.get_assets) as get_assets:
+            tags = utils.get_as_tags_many(['vendor', 'main'], attrs='defer')
+            get_assets.assert_called_once()
+        self.assertEqual(tags, [
+            '<link href="{0}vendor.css" rel="stylesheet" defer/>'.format(prefix),
+            '<link href="{0}main.css" rel="stylesheet" defer/>'.format(prefix),
+            '<script src="{0}vendor.js" defer></script>'.format(prefix),
+            '<script src="{0}main.js" defer></script>'.format(prefix),
+        ])
+        self.assertEqual(
+            utils.get_as_tags_many(['main'], extensions=['js']),
+            utils.get_as_tags('main', extension='js'))
+
+        request = self.factory.get('/')
+        output = Template(
+            "{% load render_bundle render_bundles from webpack_loader %}"
+            "{% render_bundle 'vendor' 'js' %}"
+            "{% render_bundles 'vendor' 'main' skip_common_chunks=True %}"
+        ).render(Context({'request': request}))
+        self.assertEqual(output.count('vendor.js'), 1)
+        self.assertEqual(output.count('vendor.css'), 1)
+        self.assertLess(output.index('main.css'), output.index('main.js'))
+
+    def _render_bundles_view(self, request):
+        return TemplateResponse(request, engines['django'].from_string(
+            "{% load render_bundle from webpack_loader %}"
+            "{% render_bundle 'main' %}"))
+
+    def test_preload_link_header_middleware(self):
+        from webpack_loader.middleware import PreloadLinkHeaderMiddleware
+
+        self._write_stats_file({
+            'status': 'done',
+            'chunks': {'main': ['main.js', 'main.css', 'logo.png']},
+            'assets': {
+                'main.js': {'name': 'main.js'},
+                'main.css': {'name': 'main.css'},
+                'logo.png': {'name': 'logo.png'},
+            },
+        })
+        middleware = PreloadLinkHeaderMiddleware(
+            lambda request: self._render_bundles_view(request).render())
+        response = middleware(self.factory.get('/'))
+        self.assertEqual(response['Link'], (
+            '</static/django_webpack_loader_bundles/main.css>; rel=preload; '
+            'as=style, </static/django_webpack_loader_bundles/main.js>; '
+            'rel=preload; as=script'))
+
+        middleware = PreloadLinkHeaderMiddleware(
+            lambda request: HttpResponse())
+        self.assertNotIn('Link', middleware(self.factory.get('/')))
+
+    def test_early_hints_middleware(self):
+        from webpack_loader.middleware import EarlyHintsMiddleware
+
+        self._write_stats_file(_main_stats())
+        link = (
+            '</static/django_webpack_loader_bundles/main.js>; rel=preload; '
+            'as=script')
+        middleware = EarlyHintsMiddleware(self._render_bundles_view)
+        early_hints = []
+        for _ in range(2):
+            request = self.factory.get('/')
+            request.META['wsgi.early_hints'] = early_hints.append
+            middleware.process_view(request, self._render_bundles_view, (), {})
+            response = self._render_bundles_view(request).render()
+            response = middleware.process_response(request, response)
+            self.assertEqual(response['Link'], link)
+        # The links are only known once the view rendered them
+        self.assertEqual(early_hints, [[('Link', link)]])
+
+    def test_server_timing_middleware(self):
+        from webpack_loader.middleware import ServerTimingMiddleware
+
+        self._write_stats_file(_main_stats())
+
+        def view(request):
+            response = self._render_bundles_view(request).render()
+            response['Server-Timing'] = 'db;dur=2'
+            return response
+
+        middleware = ServerTimingMiddleware(view)
+        header = middleware(self.factory.get('/'))['Server-Timing']
+        entries = [entry.split(';') for entry in header.split(', ')]
+        self.assertEqual(entries[0], ['db', 'dur=2'])
+        self.assertEqual(
+            [entry[0] for entry in entries[1:]],
+            ['webpack-stats', 'webpack-bundle', 'webpack-render'])
+        self.assertRegex(entries[1][2], r'^desc="1 reads of \d+ checks"$')
+        self.assertEqual(entries[3][2], 'desc="1 bundles rendered"')
+
+        # Only the loaders used while handling the request are reported
+        header = middleware(self.factory.get('/'))['Server-Timing']
+        self.assertRegex(header, r'desc="0 reads of \d+ checks"')
+        utils.get_files('main')
+        self.assertNotIn(
+            'Server-Timing',
+            ServerTimingMiddleware(lambda request: HttpResponse())(
+                self.factory.get('/')))
+
+    def test_server_timing_middleware_with_metrics(self):
+        from webpack_loader import metrics
+        from webpack_loader.middleware import ServerTimingMiddleware
+
+        self._write_stats_file(_main_stats())
+        loader = utils.get_loader(DEFAULT_CONFIG)
+        # As at startup, the metrics are enabled before the middleware
+        metrics.enable()
+        self.addCleanup(metrics.disable)
+        metrics.registry.clear()
+        self.addCleanup(metrics.registry.clear)
+        middleware = ServerTimingMiddleware(
+            lambda request: self._render_bundles_view(request).render())
+
+        with patch.dict(loader.config, {'METRICS': True}):
+            header = middleware(self.factory.get('/'))['Server-Timing']
+        self.assertEqual(
+            [entry.split(';')[0] for entry in header.split(', ')],
+            ['webpack-stats', 'webpack-bundle', 'webpack-render'])
+        self.assertEqual(
+            metrics.tag_cache.get(config=DEFAULT_CONFIG, result='miss'), 1)
+
+    def test_cache_backend_loader(self):
+        from django.core.cache import caches
+        from django.core.management.base import CommandError
+
+        from webpack_loader.loaders import CacheBackendWebpackLoader
+
+        stats = _main_stats()
+        statsfile = self._write_stats_file(stats)
+        loader = CacheBackendWebpackLoader('CACHED', dict(
+            get_loader(DEFAULT_CONFIG).config, STATS_FILE='missing.json',
+            STATS_CACHE_KEY='test-stats', STATS_CHECK_INTERVAL=0))
+        self.assertRaisesMessage(
+            IOError, 'Did you run the publish_webpack_stats management command?',
+            loader.get_assets)
+
+        out = StringIO()
+        with patch('webpack_loader.management.commands.publish_webpack_stats.'
+                   'get_loader', return_value=loader):
+            call_command(
+                'publish_webpack_stats', 'CACHED', stats_file=statsfile,
+                stdout=out)
+            with self.assertRaises(CommandError):
+                call_command('publish_webpack_stats', stats_file=statsfile)
+        self.assertIn('Published version', out.getvalue())
+
+        cache = caches['default']
+        with patch.object(cache, 'get', wraps=cache.get) as get:
+            self.assertEqual(next(loader.get_bundle('main'))['name'], 'main.js')
+            self.assertEqual(get.call_count, 2)
+            assets = loader.get_assets()
+            # Only the version is fetched while it doesn't change
+            self.assertEqual(get.call_count, 3)
+            # The version is checked every 10 seconds by default
+            with patch.dict(loader.config, {'STATS_CHECK_INTERVAL': None}):
+                self.assertEqual(loader.get_check_interval(), 10)
+                self.assertIs(loader.get_assets(), assets)
+            self.assertEqual(get.call_count, 3)
+
+        previous_version = cache.get('test-stats:version')
+        stats['chunks']['main'] = ['vendors.js', 'main.js']
+        stats['assets']['vendors.js'] = {'name': 'vendors.js'}
+        self._write_stats_file(stats)
+        # Stats the cache doesn't keep, e.g. too large, aren't published
+        with patch.object(cache, 'set') as set_mock:
+            self.assertRaisesMessage(
+                IOError, 'did not keep version', loader.publish_stats,
+                statsfile)
+            set_mock.assert_called_once()
+        self.assertEqual(cache.get('test-stats:version'), previous_version)
+
+        with patch.object(cache, 'touch', wraps=cache.touch) as touch:
+            loader.publish_stats(statsfile)
+        # The previous stats expire
+        touch.assert_called_once_with(
+            'test-stats:{0}'.format(previous_version), timeout=300)
+        self.assertEqual(
+            [chunk['name'] for chunk in loader.get_bundle('main')],
+            ['vendors.js', 'main.js'])
+
+        # Stats lost by the cache are still served from memory
+        cache.clear()
+        self.assertEqual(loader.get_assets()['chunks']['main'], ['vendors.js', 'main.js'])
+
+    def _start_stats_server(self, stats):
+        '''
+        Serve `stats` over HTTP, as the JSON body of every GET, and return
+        the server and the list of its requests.
+        '''
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        requests = []
+
+        class StatsHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                body = json.dumps(stats).encode('utf-8')
+                etag = '"{0}"'.format(hash(body))
+                requests.append(
+                    (self.client_address, self.headers.get('If-None-Match')))
+                if stats.get('status') == 'fail':
+                    self.send_response(500)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                elif self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                else:
+                    self.send_response(200)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StatsHandler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server, requests
+
+    def test_http_loader(self):
+        from webpack_loader.loaders import HttpWebpackLoader
+
+        stats = _main_stats()
+        server, requests = self._start_stats_server(stats)
+        loader = HttpWebpackLoader('REMOTE', dict(
+            get_loader(DEFAULT_CONFIG).config, STATS_CHECK_INTERVAL=60,
+            STATS_URL='http://127.0.0.1:{0}/webpack-stats.json'.format(
+                server.server_port)))
+
+        def wait_for_refresh():
+            for _ in range(100):
+                if loader._refreshing is None:
+                    return
+                time.sleep(0.01)
+            self.fail('The stats were not refreshed')
+
+        assets = loader.get_assets()
+        self.assertEqual(assets, stats)
+        self.assertIs(loader.get_assets(), assets)
+        self.assertEqual(len(requests), 1)
+
+        # Stale stats are still used while they are revalidated
+        loader._stats_file_cache.checked_at -= 60
+        self.assertIs(loader.get_assets(), assets)
+        wait_for_refresh()
+        self.assertIs(loader.get_assets(), assets)
+        self.assertEqual(len(requests), 2)
+        self.assertIsNotNone(requests[1][1])
+        # Both requests used the same connection
+        self.assertEqual(requests[0][0], requests[1][0])
+
+        stats['chunks']['main'] = ['vendors.js', 'main.js']
+        stats['assets']['vendors.js'] = {'name': 'vendors.js'}
+        loader._stats_file_cache.checked_at -= 60
+        loader.get_assets()
+        wait_for_refresh()
+        self.assertEqual(
+            [chunk['name'] for chunk in loader.get_bundle('main')],
+            ['vendors.js', 'main.js'])
+
+        # Failed refreshes keep the last stats
+        assets = loader.get_assets()
+        stats['status'] = 'fail'
+        loader._stats_file_cache.checked_at -= 60
+        with self.assertWarns(RuntimeWarning):
+            loader.get_assets()
+            wait_for_refresh()
+        self.assertIs(loader.get_assets(), assets)
+        # The stats are revalidated every 10 seconds by default
+        with patch.dict(loader.config, {'STATS_CHECK_INTERVAL': None}):
+            self.assertEqual(loader.get_check_interval(), 10)
+
+        server.shutdown()
+        server.server_close()
+        loader = HttpWebpackLoader('REMOTE', loader.config)
+        self.assertRaisesMessage(
+            IOError, 'Error fetching the webpack stats', loader.get_assets)
+
+    def _assert_storage_loader(self, storage):
+        from webpack_loader.loaders import StorageWebpackLoader
+
+        stats = _main_stats()
+        storage.save('webpack-stats.json', ContentFile(json.dumps(stats)))
+        loader = StorageWebpackLoader('STORAGE', dict(
+            get_loader(DEFAULT_CONFIG).config, STATS_FILE='webpack-stats.json',
+            STATS_CHECK_INTERVAL=60))
+
+        with patch.object(loader, 'get_stats_storage', return_value=storage), \
+                patch.object(storage, 'open', wraps=storage.open) as open_mock:
+            assets = loader.get_assets()
+            self.assertEqual(assets, stats)
+            self.assertIs(loader.get_assets(), assets)
+            open_mock.assert_called_once()
+            # The signature is checked every 10 seconds by default
+            with patch.dict(loader.config, {'STATS_CHECK_INTERVAL': None}):
+                self.assertEqual(loader.get_check_interval(), 10)
+
+            # Rewrites are picked up once STATS_CHECK_INTERVAL passed
+            stats['chunks']['main'] = ['vendors.js', 'main.js']
+            stats['assets']['vendors.js'] = {'name': 'vendors.js'}
+            storage.delete('webpack-stats.json')
+            storage.save('webpack-stats.json', ContentFile(json.dumps(stats)))
+            self.assertIs(loader.get_assets(), assets)
+            loader._stats_file_cache.checked_at -= 60
+            self.assertEqual(
+                [chunk['name'] for chunk in loader.get_bundle('main')],
+                ['vendors.js', 'main.js'])
+
+            storage.delete('webpack-stats.json')
+            loader._stats_file_cache.checked_at -= 60
+            with self.assertWarns(RuntimeWarning):
+                self.assertEqual(loader.get_assets(), stats)
+
+            # Errors of remote storages aren't always OSErrors
+            class ClientError(Exception):
+                pass
+
+            loader._stats_file_cache.checked_at -= 60
+            with patch.object(storage, 'get_modified_time',
+                              side_effect=ClientError('Access Denied')), \
+                    self.assertWarnsRegex(RuntimeWarning, 'Access Denied'):
+                self.assertEqual(loader.get_assets(), stats)
+
+            loader = StorageWebpackLoader('STORAGE', loader.config)
+            with patch.object(loader, 'get_stats_storage', return_value=storage):
+                self.assertRaisesMessage(
+                    IOError, 'Error reading webpack-stats.json',
+                    loader.get_assets)
+                with patch.object(storage, 'get_modified_time',
+                                  side_effect=ClientError('Access Denied')):
+                    self.assertRaises(ClientError, loader.get_assets)
+
+    def test_storage_loader(self):
+        from tempfile import mkdtemp
+
+        from django.core.files.storage import FileSystemStorage
+
+        self._assert_storage_loader(MemoryStorage())
+        location = mkdtemp()
+        self.addCleanup(rmtree, location)
+        self._assert_storage_loader(FileSystemStorage(location=location))
+
+    def test_stats_storage(self):
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        from webpack_loader.loaders import StorageWebpackLoader
+
+        loader = StorageWebpackLoader('STORAGE', dict(
+            get_loader(DEFAULT_CONFIG).config, STATS_STORAGE=None))
+        self.assertIs(loader.get_stats_storage(), staticfiles_storage)
+        loader.config['STATS_STORAGE'] = 'app.tests.test_webpack.MemoryStorage'
+        storage = loader.get_stats_storage()
+        self.assertIsInstance(storage, MemoryStorage)
+        self.assertIs(loader.get_stats_storage(), storage)
+
+    @skipIf(django.VERSION < (4, 2), 'STORAGES was added in Django 4.2')
+    def test_stats_storage_alias(self):
+        from webpack_loader.loaders import StorageWebpackLoader
+
+        loader = StorageWebpackLoader('STORAGE', dict(
+            get_loader(DEFAULT_CONFIG).config, STATS_STORAGE='stats'))
+        with self.settings(STORAGES=dict(settings.STORAGES, stats={
+                'BACKEND': 'app.tests.test_webpack.MemoryStorage'})):
+            self.assertIsInstance(loader.get_stats_storage(), MemoryStorage)
+
+    def test_assets_by_source_filename(self):
+        self._write_stats_file({
+            'status': 'done',
+            'chunks': {},
+            'assets': {
+                'assets/add-1a2b.svg': {
+                    'name': 'assets/add-1a2b.svg',
+                    'sourceFilename': 'icons/add.svg'},
+                'assets/remove-3c4d.svg': {
+                    'name': 'assets/remove-3c4d.svg',
+                    'sourceFilename': 'icons/remove.svg'},
+                'main.js': {'name': 'main.js'},
+            },
+        })
+        loader = get_loader(DEFAULT_CONFIG)
+        self.assertEqual(
+            loader.get_asset_by_source_filename('icons/add.svg')['name'],
+            'assets/add-1a2b.svg')
+        # The index is only built once per stats file version
+        self.assertIs(
+            loader.get_source_filename_index(loader.get_assets()),
+            loader.get_source_filename_index(loader.get_assets()))
+
+        template = Template(
+            "{% load webpack_asset webpack_assets from webpack_loader %}"
+            "{% webpack_asset 'icons/add.svg' %}|"
+            "{% webpack_assets 'icons/remove.svg' 'icons/missing.svg' 'icons/add.svg' as icons %}"
+            "{% for icon in icons %}{{ icon }},{% endfor %}")
+        self.assertEqual(template.render(Context()), (
+            '/static/assets/add-1a2b.svg|'
+            '/static/assets/remove-3c4d.svg,None,/static/assets/add-1a2b.svg,'))
+
+    def test_binary_stats_cache(self):
+        stats = _main_stats()
+        self._write_stats_file(stats)
+        loader = get_loader(DEFAULT_CONFIG)
+        binary_path = loader.get_binary_stats_path()
+        self.addCleanup(lambda: os.path.exists(binary_path) and os.remove(binary_path))
+        out = StringIO()
+        call_command('compile_webpack_stats', DEFAULT_CONFIG, stdout=out)
+        self.assertIn(binary_path, out.getvalue())
+
+        config = dict(loader.config, STATS_BINARY_CACHE=True)
+        with patch('webpack_loader.loaders.json.loads') as loads_mock:
+            self.assertEqual(
+                WebpackLoader(DEFAULT_CONFIG, config).get_assets(), stats)
+            loads_mock.assert_not_called()
+
+        # A changed stats file is parsed again and its binary copy updated
+        stats['chunks']['main'] = []
+        self._write_stats_file(stats)
+        self.assertEqual(
+            WebpackLoader(DEFAULT_CONFIG, config).get_assets(), stats)
+        with patch('webpack_loader.loaders.json.loads') as loads_mock:
+            self.assertEqual(
+                WebpackLoader(DEFAULT_CONFIG, config).get_assets(), stats)
+            loads_mock.assert_not_called()
+
+    def test_compile_webpack_stats_defaults(self):
+        from webpack_loader.loaders import HttpWebpackLoader
+
+        self._write_stats_file({'status': 'done', 'chunks': {}, 'assets': {}})
+        loader = WebpackLoader(DEFAULT_CONFIG, dict(
+            get_loader(DEFAULT_CONFIG).config, STATS_BINARY_CACHE=True))
+        binary_path = loader.get_binary_stats_path()
+        self.addCleanup(lambda: os.path.exists(binary_path) and os.remove(binary_path))
+        http_loader = HttpWebpackLoader('APP2', dict(
+            get_loader('APP2').config, STATS_BINARY_CACHE=True,
+            STATS_URL='http://localhost:3000/webpack-stats.json'))
+        loaders = {DEFAULT_CONFIG: loader, 'APP2': http_loader}
+        command = 'webpack_loader.management.commands.compile_webpack_stats'
+        out = StringIO()
+        # Only the configurations using a binary copy of a local stats file
+        with patch(command + '.get_config_names', return_value=list(loaders)), \
+                patch(command + '.get_loader', side_effect=loaders.get), \
+                patch.object(http_loader, 'compile_binary_stats') as http_mock:
+            call_command('compile_webpack_stats', stdout=out)
+        self.assertEqual(out.getvalue(), 'Wrote {0}\n'.format(binary_path))
+        http_mock.assert_not_called()
+
+        out = StringIO()
+        call_command('compile_webpack_stats', stdout=out)
+        self.assertEqual(out.getvalue(), '')
+
+    def test_compact_stats(self):
+        stats = {
+            'status': 'done',
+            'publicPath': 'auto',
+            'chunks': {'main': ['main.css', 'main.js']},
+            'assets': {
+                'main.css': {
+                    'name': 'main.css', 'path': '/tmp/main.css',
+                    'publicPath': 'auto'},
+                'main.js': {
+                    'name': 'main.js', 'path': '/tmp/main.js',
+                    'publicPath': 'auto', 'integrity': 'sha256-abc'},
+            },
+        }
+        self._write_stats_file(stats)
+        loader = get_loader(DEFAULT_CONFIG)
+        expected_files = get_files('main')
+
+        with patch.dict(loader.config, {'COMPACT_STATS': True}):
+            # Different stats file so that it is parsed again
+            stats['version'] = 1
+            self._write_stats_file(stats)
+            assets = loader.get_assets()
+            self.assertEqual(assets['chunks']['main'], ('main.css', 'main.js'))
+            self.assertIs(
+                assets['chunks']['main'][1], assets['assets']['main.js']['name'])
+            self.assertEqual(assets['assets']['main.js'], {
+                'name': 'main.js', 'publicPath': 'auto',
+                'integrity': 'sha256-abc'})
+            self.assertIsNone(assets['assets']['main.css'].get('integrity'))
+            with self.assertRaises(KeyError):
+                assets['assets']['main.css']['path']
+            self.assertEqual(get_files('main'), expected_files)
+
     def test_bad_status_in_production(self):
         statsfile = settings.WEBPACK_LOADER[DEFAULT_CONFIG]['STATS_FILE']
         with open(statsfile, 'w') as fd:
@@ -0,0 +1,99 @@
+'''
+Measure the event loop latency while async views wait for webpack to
+finish compiling, with `get_files` and with `aget_files`.
+
+Run from the tests directory: python benchmarks/async_compile_wait.py
+'''
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+TICK = 0.005
+
+
+def write_stats(path, stats):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(stats, f)
+    os.replace(path + '.tmp', path)
+
+
+async def measure_lag(stop):
+    'Return how late each tick of a periodic task ran, in seconds.'
+    lags = []
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        then = loop.time()
+        await asyncio.sleep(TICK)
+        lags.append(loop.time() - then - TICK)
+    return lags
+
+
+async def run(stats_file, use_async, requests, rebuild):
+    from webpack_loader.utils import aget_files, get_files
+
+    async def request():
+        if use_async:
+            return await aget_files('main')
+        return get_files('main')
+
+    write_stats(stats_file, {'status': 'compile'})
+    threading.Timer(rebuild, write_stats, args=(stats_file, {
+        'status': 'done',
+        'chunks': {'main': ['main.js']},
+        'assets': {'main.js': {'name': 'main.js'}},
+    })).start()
+
+    stop = asyncio.Event()
+    lag_task = asyncio.ensure_future(measure_lag(stop))
+    # Let the lag task take its first tick
+    await asyncio.sleep(0)
+    then = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(requests)))
+    elapsed = time.perf_counter() - then
+    stop.set()
+    lags = sorted(await lag_task)
+    return elapsed, lags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--rebuild', type=float, default=1.0,
+                        help='seconds webpack takes to compile')
+    args = parser.parse_args()
+
+    stats_file = os.path.join(tempfile.mkdtemp(), 'webpack-stats.json')
+    settings.configure(
+        DEBUG=True,
+        INSTALLED_APPS=['django.contrib.staticfiles', 'webpack_loader'],
+        STATIC_URL='/static/',
+        WEBPACK_LOADER={'DEFAULT': {
+            'CACHE': False, 'STATS_FILE': stats_file,
+            'POLL_INTERVAL': 0.05, 'TIMEOUT': 30,
+        }},
+    )
+    django.setup()
+
+    print('{0} requests, {1}s rebuild'.format(args.requests, args.rebuild))
+    print('{0:<12}{1:>10}{2:>14}{3:>14}'.format(
+        'api', 'total (s)', 'p99 lag (ms)', 'max lag (ms)'))
+    for name, use_async in (('get_files', False), ('aget_files', True)):
+        elapsed, lags = asyncio.run(
+            run(stats_file, use_async, args.requests, args.rebuild))
+        p99 = lags[int(len(lags) * 0.99) - 1] if len(lags) > 1 else lags[-1]
+        print('{0:<12}{1:>10.2f}{2:>14.1f}{3:>14.1f}'.format(
+            name, elapsed, p99 * 1000, lags[-1] * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+'''
+Compare `get_files` with and without CACHE_CHUNK_URLS, for the default
+static files storage and ManifestStaticFilesStorage.
+
+Run from the tests directory: python benchmarks/chunk_urls.py
+'''
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+STORAGES = {
+    'StaticFilesStorage':
+        'django.contrib.staticfiles.storage.StaticFilesStorage',
+    'ManifestStaticFilesStorage':
+        'django.contrib.staticfiles.storage.ManifestStaticFilesStorage',
+}
+
+
+def write_files(directory, chunks):
+    'Write a stats file and a static files manifest with `chunks` chunks.'
+    names = ['chunk-{0}.js'.format(i) for i in range(chunks)]
+    stats_file = os.path.join(directory, 'webpack-stats.json')
+    with open(stats_file, 'w') as f:
+        json.dump({
+            'status': 'done',
+            'chunks': {'main': names},
+            'assets': {name: {'name': name} for name in names},
+        }, f)
+    static_root = os.path.join(directory, 'static')
+    os.mkdir(static_root)
+    with open(os.path.join(static_root, 'staticfiles.json'), 'w') as f:
+        json.dump({'version': '1.1', 'paths': {
+            'bundles/' + name: 'bundles/{0}.0123456789ab.js'.format(name[:-3])
+            for name in names
+        }}, f)
+    return stats_file, static_root
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--chunks', type=int, default=200)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    stats_file, static_root = write_files(tempfile.mkdtemp(), args.chunks)
+    settings.configure(
+        DEBUG=False,
+        INSTALLED_APPS=['django.contrib.staticfiles', 'webpack_loader'],
+        STATIC_URL='/static/',
+        STATIC_ROOT=static_root,
+        WEBPACK_LOADER={'DEFAULT': {
+            'CACHE': True, 'STATS_FILE': stats_file,
+            'BUNDLE_DIR_NAME': 'bundles/',
+        }},
+    )
+    django.setup()
+
+    from django.test.utils import override_settings
+
+    from webpack_loader.utils import get_files, get_loader
+
+    loader = get_loader('DEFAULT')
+    print('{0} chunks, best of 5 x {1} calls'.format(args.chunks, args.number))
+    print('{0:<28}{1:<18}{2:>12}'.format('storage', 'CACHE_CHUNK_URLS', 'ops/sec'))
+    for name, backend in STORAGES.items():
+        storages = {'staticfiles': {'BACKEND': backend}}
+        with override_settings(STORAGES=storages):
+            for cache_chunk_urls in (False, True):
+                loader.config['CACHE_CHUNK_URLS'] = cache_chunk_urls
+                get_files('main')
+                best = min(timeit.repeat(
+                    lambda: get_files('main'), number=args.number, repeat=5))
+                print('{0:<28}{1:<18}{2:>12.0f}'.format(
+                    name, str(cache_chunk_urls), args.number / best))
+
+
+if __name__ == '__main__':
+    main()
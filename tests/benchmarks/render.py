@@ -0,0 +1,158 @@
+'''
+Measure the render path: `render_bundle` in Django and Jinja2 templates,
+`get_files`, `webpack_static` and `webpack_asset`, against synthetic stats
+files of growing size, with and without CACHE, integrity and publicPath.
+
+Reports the calls per second and the peak memory allocated by one call.
+
+Run from the tests directory: python benchmarks/render.py
+'''
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+# Configurations to the keys added to the assets of their stats file
+VARIANTS = {
+    'PLAIN': (),
+    'INTEGRITY': ('integrity',),
+    'PUBLIC_PATH': ('publicPath',),
+}
+
+
+def generate_stats(chunks, integrity=False, public_path=False):
+    '''
+    Return the stats of a build whose `main` bundle has `chunks` chunks,
+    alternately scripts and styles, each with a source filename.
+    '''
+    names = [
+        'chunk-{0}.{1}'.format(i, 'css' if i % 2 else 'js')
+        for i in range(chunks)
+    ]
+    assets = {}
+    for name in names:
+        asset = {'name': name, 'sourceFilename': 'src/' + name}
+        if integrity:
+            asset['integrity'] = 'sha256-{0:044d} sha384-{0:064d}'.format(
+                len(assets))
+        if public_path:
+            asset['publicPath'] = 'https://cdn.example.com/bundles/' + name
+        assets[name] = asset
+    return {'status': 'done', 'chunks': {'main': names}, 'assets': assets}
+
+
+def write_stats_files(directory, chunks):
+    'Write the stats file of each variant, returning their paths.'
+    paths = {}
+    for config, keys in VARIANTS.items():
+        path = os.path.join(directory, '{0}-{1}.json'.format(config, chunks))
+        with open(path, 'w') as f:
+            json.dump(generate_stats(
+                chunks, integrity='integrity' in keys,
+                public_path='publicPath' in keys), f)
+        paths[config] = path
+    return paths
+
+
+def get_cases(config, chunks):
+    'Return the name and callable of each measured call for `config`.'
+    from django.template import engines
+    from jinja2 import Environment
+
+    from webpack_loader.templatetags.webpack_loader import (
+        webpack_asset,
+        webpack_static,
+    )
+    from webpack_loader.utils import get_files
+
+    django_template = engines['django'].from_string(
+        "{{% load render_bundle from webpack_loader %}}"
+        "{{% render_bundle 'main' config='{0}' %}}".format(config))
+    jinja_template = Environment(
+        extensions=['webpack_loader.contrib.jinja2ext.WebpackExtension'],
+    ).from_string("{{{{ render_bundle('main', config='{0}') }}}}".format(config))
+    source_filename = 'src/chunk-{0}.js'.format((chunks - 1) // 2 * 2)
+    return [
+        ('render_bundle (django)', lambda: django_template.render({})),
+        ('render_bundle (jinja2)', lambda: jinja_template.render()),
+        ('get_files', lambda: get_files('main', config=config)),
+        ('webpack_static', lambda: webpack_static('main.js', config=config)),
+        ('webpack_asset',
+            lambda: webpack_asset(source_filename, config=config)),
+    ]
+
+
+def measure(func, repeat):
+    'Return the calls per second and the peak KiB allocated by one call.'
+    func()
+    timer = timeit.Timer(func)
+    number, _time = timer.autorange()
+    best = min(timer.repeat(number=number, repeat=repeat))
+
+    # Only allocations made after start() are traced, so the peak is the one
+    # of this call (tracemalloc.reset_peak() needs Python 3.9)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return number / best, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--chunks', type=int, nargs='+', default=[100, 1000, 10000],
+        help='Sizes of the main bundle to measure, up to e.g. 50000.')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    stats_files = {
+        chunks: write_stats_files(directory, chunks) for chunks in args.chunks
+    }
+    settings.configure(
+        DEBUG=False,
+        INSTALLED_APPS=['django.contrib.staticfiles', 'webpack_loader'],
+        STATIC_URL='/static/',
+        TEMPLATES=[{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        }],
+        WEBPACK_LOADER={
+            config: {'INTEGRITY': config == 'INTEGRITY'} for config in VARIANTS
+        },
+    )
+    django.setup()
+    # Rendering without a request warns about crossorigin with INTEGRITY
+    warnings.simplefilter('ignore', RuntimeWarning)
+
+    from webpack_loader.utils import get_loader
+
+    print('Best of {0} runs, peak memory of one call'.format(args.repeat))
+    print('{0:>8}  {1:<13}{2:<7}{3:<24}{4:>12}{5:>12}'.format(
+        'chunks', 'stats', 'CACHE', 'call', 'ops/sec', 'peak KiB'))
+    for chunks in args.chunks:
+        for config in VARIANTS:
+            loader = get_loader(config)
+            loader.config['STATS_FILE'] = stats_files[chunks][config]
+            for cache in (False, True):
+                loader.config['CACHE'] = cache
+                loader._assets = {}
+                for name, func in get_cases(config, chunks):
+                    ops, peak = measure(func, args.repeat)
+                    print('{0:>8}  {1:<13}{2:<7}{3:<24}{4:>12.0f}{5:>12.1f}'
+                          .format(chunks, config, str(cache), name, ops, peak))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,3 +5,33 @@ import django
 
 if django.VERSION < (3, 2):  # pragma: no cover
     default_app_config = "webpack_loader.apps.WebpackLoaderConfig"
+
+
+def preload(config_names=None, freeze=True):
+    """
+    Load the webpack stats in the current process, before it forks workers.
+
+    Call it from e.g. gunicorn's ``on_starting`` hook, once Django is set up.
+    With ``freeze``, everything allocated so far is moved out of reach of the
+    garbage collector (see ``gc.freeze``), so collections in the workers
+    don't write to the memory pages holding the stats and they stay shared
+    between processes.
+
+    :param config_names: (optional) the names of the configurations, all by default
+    :param freeze: (optional) whether to call ``gc.freeze``
+    :return: a ``webpack_loader.utils.PreloadReport``
+    """
+    import gc
+
+    from . import utils
+
+    if config_names is None:
+        config_names = utils.get_config_names()
+    errors = utils.preload(config_names)
+    loaded = [name for name in config_names if name not in errors]
+    report = utils.PreloadReport(
+        errors=errors, shared_bytes=utils.get_stats_size(loaded))
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    return report
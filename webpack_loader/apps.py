@@ -1,6 +1,10 @@
 from django.apps import AppConfig
 
-from .errors import BAD_CONFIG_ERROR
+from .errors import (
+    BAD_CONFIG_ERROR,
+    stats_file_compiling_error,
+    stats_file_unreadable_error,
+)
 
 
 def webpack_cfg_check(*args, **kwargs):
@@ -20,6 +24,35 @@ def webpack_cfg_check(*args, **kwargs):
     return errors
 
 
+def _get_preload_config_names():
+    from .config import get_config_names, load_config
+
+    return [
+        name for name in get_config_names() if load_config(name).get('PRELOAD')
+    ]
+
+
+def webpack_stats_check(*args, **kwargs):
+    '''Test if the stats files of preloaded configs are ready to be served'''
+    from django.conf import settings
+
+    if settings.DEBUG or webpack_cfg_check():
+        return []
+
+    from .utils import get_loader
+
+    errors = []
+    for name in _get_preload_config_names():
+        try:
+            assets = get_loader(name).get_assets()
+        except Exception as e:
+            errors.append(stats_file_unreadable_error(name, e))
+            continue
+        if assets.get('status') == 'compile':
+            errors.append(stats_file_compiling_error(name))
+    return errors
+
+
 class WebpackLoaderConfig(AppConfig):
     name = 'webpack_loader'
     verbose_name = "Webpack Loader"
@@ -27,3 +60,16 @@ class WebpackLoaderConfig(AppConfig):
     def ready(self):
         from django.core.checks import register, Tags
         register(Tags.compatibility)(webpack_cfg_check)
+        register(Tags.staticfiles)(webpack_stats_check)
+
+        if webpack_cfg_check():
+            return
+        from .config import get_config_names, load_config
+        if any(load_config(name).get('METRICS') for name in get_config_names()):
+            from . import metrics
+            metrics.enable()
+        config_names = _get_preload_config_names()
+        if config_names:
+            from .utils import preload
+            # Errors are reported by webpack_stats_check
+            preload(config_names)
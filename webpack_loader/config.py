@@ -2,19 +2,46 @@ import re
 
 from django.conf import settings
 
-__all__ = ('load_config',)
+__all__ = ('load_config', 'get_config_names')
 
 
 DEFAULT_CONFIG = {
     'DEFAULT': {
         'CACHE': not settings.DEBUG,
         'BUNDLE_DIR_NAME': 'webpack_bundles/',
+        # Keep the static files storage URL of each chunk per stats version.
+        # Disable for storages returning different URLs over time, like
+        # signed URLs.
+        'CACHE_CHUNK_URLS': True,
         'STATS_FILE': 'webpack-stats.json',
-        # FIXME: Explore usage of fsnotify
+        # Seconds to trust the last stat() of STATS_FILE before checking it
+        # again. Useful when the stats file lives on a slow network filesystem.
+        # None for the default of the loader, 0 for WebpackLoader.
+        'STATS_CHECK_INTERVAL': None,
+        # Compare a content hash before re-parsing a rewritten STATS_FILE
+        'STATS_CONTENT_HASH': False,
+        # Load a binary copy of STATS_FILE, see compile_webpack_stats
+        'STATS_BINARY_CACHE': False,
+        # Only keep the parts of STATS_FILE the loader uses, in less memory
+        'COMPACT_STATS': False,
         'POLL_INTERVAL': 0.1,
+        # Wake requests waiting on a compiling bundle as soon as the stats
+        # file changes, using inotify where available
+        'WATCH_STATS_FILE': False,
         'TIMEOUT': None,
         'IGNORE': [r'.+\.hot-update.js', r'.+\.map'],
         'LOADER_CLASS': 'webpack_loader.loaders.WebpackLoader',
+        # Where CacheBackendWebpackLoader reads the stats from. The key
+        # defaults to "webpack_loader:stats:<configuration name>".
+        'STATS_CACHE_ALIAS': 'default',
+        'STATS_CACHE_KEY': None,
+        # The storage StorageWebpackLoader reads STATS_FILE from, an alias
+        # of STORAGES or a storage class, the static files storage if unset
+        'STATS_STORAGE': None,
+        # Where HttpWebpackLoader fetches the stats from, and the timeout of
+        # its requests in seconds
+        'STATS_URL': None,
+        'STATS_URL_TIMEOUT': 10,
         'INTEGRITY': False,
         # See https://shubhamjain.co/2018/09/08/subresource-integrity-crossorigin/
         # See https://developer.mozilla.org/en-US/docs/Web/HTML/Attributes/crossorigin
@@ -24,7 +51,11 @@ DEFAULT_CONFIG = {
         # update the fallback value in get_skip_common_chunks (utils.py).
         'SKIP_COMMON_CHUNKS': False,
         # Use nonces from django-csp when available
-        'CSP_NONCE': False
+        'CSP_NONCE': False,
+        # Load the stats file when Django starts instead of on first use
+        'PRELOAD': False,
+        # Collect the metrics exposed by webpack_loader.metrics.metrics_view
+        'METRICS': False,
     }
 }
 
@@ -35,9 +66,36 @@ user_config = dict(
     for name, cfg in user_config.items()
 )
 
+# Combined patterns would renumber the groups these refer to
+_BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+_DEFAULT_FLAGS = re.compile('').flags
+
+
+def _compile_ignores(patterns):
+    '''
+    Return one regex matching a chunk name whenever any of `patterns` does,
+    or `None` when there are no patterns or they can't be combined.
+    '''
+    if not patterns or any(_BACKREFERENCE.search(p) for p in patterns):
+        return None
+    # Inline global flags like (?i) would apply to every combined pattern,
+    # and older Pythons only warn when they aren't at the start
+    if any(re.compile(p).flags != _DEFAULT_FLAGS for p in patterns):
+        return None
+    try:
+        return re.compile('|'.join('(?:{0})'.format(p) for p in patterns))
+    except re.error:
+        return None
+
+
 for entry in user_config.values():
     entry['ignores'] = [re.compile(I) for I in entry['IGNORE']]
+    entry['ignore_re'] = _compile_ignores(entry['IGNORE'])
 
 
 def load_config(name):
     return user_config[name]
+
+
+def get_config_names():
+    return list(user_config)
@@ -1,22 +1,89 @@
+from jinja2 import nodes
 from jinja2.ext import Extension
 from jinja2.runtime import Context
 from jinja2.utils import pass_context
 
-from ..templatetags.webpack_loader import get_files, render_bundle
+from ..templatetags.webpack_loader import (
+    BundleFragment,
+    aget_files,
+    arender_bundle,
+    get_files,
+    render_bundle,
+)
 
 
+# With `enable_async`, Jinja awaits the coroutines returned below, so async
+# templates don't block their event loop on the loader.
 @pass_context
 def _render_bundle(context: Context, *args, **kwargs):
+    if context.environment.is_async:
+        return arender_bundle(context, *args, **kwargs)
     return render_bundle(context, *args, **kwargs)
 
 
 @pass_context
 def _get_files(context: Context, *args, **kwargs):
+    if context.environment.is_async:
+        return aget_files(context, *args, **kwargs)
     return get_files(context, *args, **kwargs)
 
 
 class WebpackExtension(Extension):
+    '''
+    Adds the `render_bundle` and `webpack_get_files` functions, and the
+    `{% render_bundle 'main', 'js' %}` tag. The tag takes the same arguments
+    as the function, and when they are all literals it renders tags built
+    once per stats version.
+    '''
+    tags = {"render_bundle"}
+
     def __init__(self, environment):
         super(WebpackExtension, self).__init__(environment)
         environment.globals["render_bundle"] = _render_bundle
         environment.globals["webpack_get_files"] = _get_files
+        # Literal tag arguments to their BundleFragment
+        self._fragments = {}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = []
+        kwargs = []
+        while parser.stream.current.type != "block_end":
+            if args or kwargs:
+                parser.stream.expect("comma")
+            if parser.stream.current.type == "name" and \
+                    parser.stream.look().type == "assign":
+                key = next(parser.stream).value
+                parser.stream.skip()
+                kwargs.append(nodes.Keyword(
+                    key, parser.parse_expression(), lineno=lineno))
+            else:
+                args.append(parser.parse_expression())
+
+        context = nodes.ContextReference()
+        if all(isinstance(arg, nodes.Const) for arg in args) and \
+                all(isinstance(kwarg.value, nodes.Const) for kwarg in kwargs):
+            key = (
+                tuple(arg.value for arg in args),
+                tuple((kwarg.key, kwarg.value.value) for kwarg in kwargs))
+            call = self.call_method(
+                "_render_fragment", [nodes.Const(key), context],
+                lineno=lineno)
+        else:
+            call = self.call_method(
+                "_render_bundle", [context] + args, kwargs, lineno=lineno)
+        return nodes.Output([call], lineno=lineno)
+
+    def _render_bundle(self, context: Context, *args, **kwargs):
+        return _render_bundle(context, *args, **kwargs)
+
+    def _render_fragment(self, key, context: Context):
+        fragment = self._fragments.get(key)
+        if fragment is None:
+            args, kwargs = key
+            fragment = self._fragments.setdefault(
+                key, BundleFragment(*args, **dict(kwargs)))
+        request = context.get("request")
+        if context.environment.is_async:
+            return fragment.arender(request)
+        return fragment.render(request)
@@ -7,3 +7,23 @@ BAD_CONFIG_ERROR = Error(
     obj='django.conf.settings.WEBPACK_LOADER',
     id='django-webpack-loader.E001',
 )
+
+
+def stats_file_unreadable_error(config_name, error):
+    return Error(
+        'Error while loading the webpack stats file of the {0!r} '
+        'configuration: {1}'.format(config_name, error),
+        hint='Did webpack run before the application was deployed?',
+        obj='django.conf.settings.WEBPACK_LOADER',
+        id='django-webpack-loader.E002',
+    )
+
+
+def stats_file_compiling_error(config_name):
+    return Error(
+        'The webpack stats file of the {0!r} configuration says webpack is '
+        'still compiling'.format(config_name),
+        hint='Wait for webpack to finish before starting the application.',
+        obj='django.conf.settings.WEBPACK_LOADER',
+        id='django-webpack-loader.E003',
+    )
@@ -1,22 +1,35 @@
+import asyncio
+import hashlib
+import http.client
 import json
+import marshal
 import os
+import threading
 import time
 from functools import lru_cache
 from io import open
 from typing import Dict, Optional
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlsplit
 from warnings import warn
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.http.request import HttpRequest
+from django.utils.module_loading import import_string
 
+from . import signals
 from .exceptions import (
     WebpackBundleLookupError,
     WebpackError,
     WebpackLoaderBadStatsError,
     WebpackLoaderTimeoutError,
 )
+from .stats import compact_stats
+from .watchers import get_stats_watcher
 
 _CROSSORIGIN_NO_REQUEST = (
     'The crossorigin attribute might be necessary but you did not pass a '
@@ -40,6 +53,49 @@ _LOADER_POSSIBLE_LIMBO = (
     'which can cause request to hang indefinitely. '
     'Validate status of webpack-stats.json file if you experience infinite loading.'
 )
+_STATS_FILE_UNREADABLE = (
+    'Error reading {0}. Are you sure webpack has generated the file and the '
+    'path is correct?')
+_STATS_FILE_INVALID = (
+    'django_webpack_loader could not parse {0}, using the last stats it read '
+    'instead. Webpack is probably still writing the file.')
+_STATS_NOT_PUBLISHED = (
+    'The webpack stats of {0} are not in the "{1}" cache. Did you run the '
+    'publish_webpack_stats management command?')
+_STATS_NOT_STORED = (
+    'The "{0}" cache did not keep version {1} of the webpack stats of {2}, '
+    'they may be larger than the values it can hold.')
+# Seconds the stats of the previous version stay in the cache once a new one
+# is published, for the processes that just read the previous version
+_PREVIOUS_STATS_TIMEOUT = 300
+_STATS_STORAGE_ERROR = 'Error reading {0} from {1}: {2}'
+_STATS_URL_ERROR = 'Error fetching the webpack stats from {0}: {1}'
+_BINARY_STATS_HEADER = ('django-webpack-loader', 1)
+# How often a stats file that can't be parsed is read again, when there are
+# no previous stats to fall back to, and the first delay between reads
+_STATS_PARSE_RETRIES = 3
+_STATS_PARSE_BACKOFF = 0.05
+
+# Settings the URLs of the static files storage depend on
+_STORAGE_SETTINGS = frozenset((
+    'STATIC_URL', 'STATIC_ROOT', 'STORAGES', 'STATICFILES_STORAGE'))
+_storage_version = 0
+
+
+@receiver(setting_changed)
+def _update_storage_version(setting, **kwargs):
+    global _storage_version
+    if setting in _STORAGE_SETTINGS:
+        _storage_version += 1
+
+
+def get_storage_version() -> int:
+    '''
+    Return a number that changes whenever the static files storage settings
+    do, to invalidate cached chunk URLs.
+    '''
+    return _storage_version
+
 
 @lru_cache(maxsize=100)
 def _get_netloc(url: str) -> str:
@@ -47,33 +103,300 @@ def _get_netloc(url: str) -> str:
     return urlparse(url=url).netloc
 
 
+def _get_file_signature(stat_result: os.stat_result) -> tuple:
+    'Return the parts of a `stat()` result that change when a file is rewritten.'
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+
+class _StatsFileCache:
+    'The last parsed stats file and what is needed to tell if it changed.'
+    __slots__ = ('path', 'signature', 'digest', 'checked_at', 'assets')
+
+    def __init__(self, path, signature, digest, checked_at, assets):
+        self.path = path
+        self.signature = signature
+        self.digest = digest
+        self.checked_at = checked_at
+        self.assets = assets
+
+
+class _CompileWait:
+    'State shared by every thread waiting for the same webpack compilation.'
+    __slots__ = ('deadline', 'finished', 'assets', 'error', 'callbacks')
+
+    def __init__(self, deadline: Optional[float]):
+        self.deadline = deadline
+        self.finished = False
+        self.assets = None
+        self.error: Optional[BaseException] = None
+        # Called with this wait once finished, used by async waiters
+        self.callbacks = []
+
+
+def _set_future_result(future: asyncio.Future, result):
+    if not future.done():
+        future.set_result(result)
+
+
 class WebpackLoader:
     _assets = {}
+    # STATS_CHECK_INTERVAL when it is not set
+    default_check_interval = 0
+    # Whether the stats come from `STATS_FILE` on the local filesystem, the
+    # loaders `compile_webpack_stats` compiles by default
+    reads_stats_file = True
+    # Replaced per instance, kept for loaders that don't call __init__
+    _stats_lock = threading.RLock()
 
     def __init__(self, name, config):
         self.name = name
         self.config = config
+        self._stats_file_cache: Optional[_StatsFileCache] = None
+        self._stats_lock = threading.RLock()
+        self._stats_watcher = None
+        self._compile_condition = threading.Condition()
+        self._compile_wait: Optional[_CompileWait] = None
+        self._assets_cache = None
 
     def load_assets(self):
+        '''
+        Return the parsed stats file, only re-reading it when it changed.
+
+        The file is considered changed when its mtime, size or inode differ
+        from the last read. With `STATS_CONTENT_HASH` enabled, a changed file
+        whose content is byte-for-byte identical is not parsed again.
+
+        A changed file is parsed into new stats that replace the previous
+        ones at once, so callers keep using the stats they already got. When
+        the file can't be parsed, e.g. because webpack is still writing it,
+        the last good stats are returned instead.
+        '''
+        started = time.perf_counter()
+        stats_file = self.config["STATS_FILE"]
+        cached = self._get_stats_file_cache(stats_file)
+        now = time.monotonic()
+        check_interval = self.get_check_interval()
+        if cached is not None and check_interval and \
+                0 <= now - cached.checked_at < check_interval:
+            return self._send_stats_loaded(cached.assets, started)
+
         try:
-            with open(self.config["STATS_FILE"], encoding="utf-8") as f:
-                return json.load(f)
+            if cached is not None and \
+                    _get_file_signature(os.stat(stats_file)) == cached.signature:
+                cached.checked_at = now
+                return self._send_stats_loaded(cached.assets, started)
         except IOError:
-            raise IOError(
-                "Error reading {0}. Are you sure webpack has generated "
-                "the file and the path is correct?".format(self.config["STATS_FILE"])
-            )
+            raise IOError(_STATS_FILE_UNREADABLE.format(stats_file))
+        with self._stats_lock:
+            return self._reload_assets(stats_file, now, started)
+
+    def get_check_interval(self):
+        '''
+        Return the seconds to trust the stats in memory before checking them
+        again, `STATS_CHECK_INTERVAL` or the default of the loader.
+        '''
+        check_interval = self.config.get("STATS_CHECK_INTERVAL")
+        if check_interval is None:
+            return self.default_check_interval
+        return check_interval
+
+    def _get_stats_file_cache(self, stats_file):
+        cached = getattr(self, '_stats_file_cache', None)
+        if cached is not None and cached.path != stats_file:
+            return None
+        return cached
+
+    def _reload_assets(self, stats_file, now, started):
+        '''
+        Read and parse the stats file, called with `_stats_lock` held so that
+        only one thread parses a changed file while the others wait for it.
+        '''
+        for attempt in range(_STATS_PARSE_RETRIES + 1):
+            cached = self._get_stats_file_cache(stats_file)
+            try:
+                with open(stats_file, "rb") as f:
+                    signature = _get_file_signature(os.fstat(f.fileno()))
+                    content = f.read() if cached is None or \
+                        signature != cached.signature else None
+            except IOError:
+                raise IOError(_STATS_FILE_UNREADABLE.format(stats_file))
+            if content is None:
+                # Parsed by another thread while this one waited for the lock
+                cached.checked_at = now
+                return self._send_stats_loaded(cached.assets, started)
+
+            digest = None
+            if self.config.get("STATS_CONTENT_HASH") or \
+                    self.config.get("STATS_BINARY_CACHE"):
+                digest = hashlib.sha1(content).digest()
+            cache_hit = digest is not None and cached is not None and \
+                digest == cached.digest
+            if cache_hit:
+                assets = cached.assets
+            else:
+                try:
+                    assets = self._parse_stats(content, digest)
+                except ValueError:
+                    if cached is not None:
+                        # Keep the cached signature, so the next call retries
+                        warn(
+                            message=_STATS_FILE_INVALID.format(stats_file),
+                            category=RuntimeWarning)
+                        return self._send_stats_loaded(cached.assets, started)
+                    if attempt == _STATS_PARSE_RETRIES:
+                        raise
+                    time.sleep(_STATS_PARSE_BACKOFF * 2 ** attempt)
+                    continue
+            self._stats_file_cache = _StatsFileCache(
+                path=stats_file, signature=signature, digest=digest,
+                checked_at=now, assets=assets)
+            return self._send_stats_loaded(
+                assets, started, cache_hit, len(content))
+
+    def _send_stats_loaded(self, assets, started, cache_hit=True, size=None):
+        '''
+        Send `stats_loaded` for the `assets` being returned, loaded since the
+        `time.perf_counter()` value `started`.
+        '''
+        if signals.stats_loaded.receivers:
+            signals.stats_loaded.send(
+                sender=type(self), loader=self, config=self.name,
+                cache_hit=cache_hit, size=size,
+                duration=time.perf_counter() - started,
+                chunk_count=len(assets.get("chunks") or ()),
+                asset_count=len(assets.get("assets") or ()))
+        return assets
+
+    def preload(self):
+        '''
+        Load the stats and build the lookup tables the first requests would
+        otherwise have to.
+        '''
+        assets = self.get_assets()
+        if assets.get("status") == "done":
+            self.get_source_filename_index(assets)
+        return assets
+
+    def _parse_stats(self, content, digest):
+        'Return the stats from the stats file `content`.'
+        if self.config.get("STATS_BINARY_CACHE"):
+            assets = self._read_binary_stats(digest)
+            if assets is None:
+                assets = json.loads(content.decode("utf-8"))
+                try:
+                    self._write_binary_stats(digest, assets)
+                except OSError:
+                    # The binary cache is optional, e.g. on read-only disks
+                    pass
+        else:
+            assets = json.loads(content.decode("utf-8"))
+        if self.config.get("COMPACT_STATS"):
+            assets = compact_stats(assets)
+        return assets
+
+    def get_binary_stats_path(self):
+        'Return where the binary copy of the stats file is kept.'
+        return self.config["STATS_FILE"] + ".marshal"
+
+    def _read_binary_stats(self, digest):
+        '''
+        Return the stats from the binary cache when it was made from a stats
+        file with the same `digest`, `None` otherwise.
+        '''
+        try:
+            with open(self.get_binary_stats_path(), "rb") as f:
+                header, cached_digest, assets = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if header != _BINARY_STATS_HEADER or cached_digest != digest:
+            return None
+        return assets
+
+    def _write_binary_stats(self, digest, assets):
+        path = self.get_binary_stats_path()
+        tmp_path = "{0}.{1}.tmp".format(path, os.getpid())
+        with open(tmp_path, "wb") as f:
+            marshal.dump((_BINARY_STATS_HEADER, digest, assets), f)
+        os.replace(tmp_path, path)
+
+    def compile_binary_stats(self):
+        '''
+        Write the binary cache for the current stats file and return its path.
+        '''
+        stats_file = self.config["STATS_FILE"]
+        with open(stats_file, "rb") as f:
+            content = f.read()
+        assets = json.loads(content.decode("utf-8"))
+        self._write_binary_stats(hashlib.sha1(content).digest(), assets)
+        return self.get_binary_stats_path()
 
     def get_assets(self):
         if self.config["CACHE"]:
-            if self.name not in self._assets:
-                self._assets[self.name] = self.load_assets()
-            return self._assets[self.name]
+            assets = self._assets.get(self.name)
+            if assets is None:
+                with self._stats_lock:
+                    assets = self._assets.get(self.name)
+                    if assets is None:
+                        assets = self._assets[self.name] = self.load_assets()
+            return assets
         return self.load_assets()
 
+    async def aget_assets(self):
+        '''
+        Async version of `get_assets`, reading the stats file in a thread so
+        that the event loop isn't blocked.
+        '''
+        if self.config["CACHE"]:
+            assets = self._assets.get(self.name)
+            if assets is not None:
+                return assets
+        return await sync_to_async(self.get_assets, thread_sensitive=False)()
+
+    def get_assets_cache(self, assets) -> dict:
+        '''
+        Return a dict for memoizing values computed from `assets`, as returned
+        by `get_assets`. A new, empty dict is returned once the stats change.
+        '''
+        cache = getattr(self, '_assets_cache', None)
+        if cache is None or cache[0] is not assets:
+            cache = self._assets_cache = (assets, {})
+        return cache[1]
+
+    def get_stats_watcher(self):
+        '''
+        Return the watcher shared by every request waiting on this loader's
+        stats file, or `None` when `WATCH_STATS_FILE` is disabled.
+        '''
+        if not self.config.get("WATCH_STATS_FILE"):
+            return None
+        watcher = getattr(self, '_stats_watcher', None)
+        if watcher is None or watcher.path != os.path.abspath(self.config["STATS_FILE"]):
+            watcher = get_stats_watcher(
+                self.config["STATS_FILE"], self.config["POLL_INTERVAL"])
+            self._stats_watcher = watcher
+        return watcher
+
+    def get_source_filename_index(self, assets):
+        'Return a dict of `sourceFilename` to asset for the passed `assets`.'
+        cache = self.get_assets_cache(assets)
+        index = cache.get("source_filenames")
+        if index is None:
+            index = {}
+            for asset in assets["assets"].values():
+                source_filename = asset.get("sourceFilename")
+                if source_filename is not None:
+                    index.setdefault(source_filename, asset)
+            cache["source_filenames"] = index
+        return index
+
     def get_asset_by_source_filename(self, name):
-        files = self.get_assets()["assets"].values()
-        return next((x for x in files if x.get("sourceFilename") == name), None)
+        index = self.get_source_filename_index(self.get_assets())
+        return index.get(name)
+
+    def get_assets_by_source_filenames(self, names):
+        'Return the asset for each of `names`, or `None` when unknown.'
+        index = self.get_source_filename_index(self.get_assets())
+        return [index.get(name) for name in names]
 
     def _add_crossorigin(
             self, request: Optional[HttpRequest], chunk: Dict[str, str],
@@ -140,6 +463,11 @@ class WebpackLoader:
         return f'nonce="{nonce}" '
 
     def filter_chunks(self, chunks):
+        ignore_re = self.config.get("ignore_re")
+        if ignore_re is not None:
+            match = ignore_re.match
+            return [chunk for chunk in chunks if not match(chunk)]
+
         filtered_chunks = []
 
         for chunk in chunks:
@@ -149,14 +477,69 @@ class WebpackLoader:
 
         return filtered_chunks
 
-    def map_chunk_files_to_url(self, chunks):
-        assets = self.get_assets()
+    def get_filtered_chunks(self, bundle_name, assets):
+        '''
+        Return the chunks of the named bundle that aren't ignored, checked
+        once per stats version.
+        '''
+        cache = self.get_assets_cache(assets)
+        key = ("chunks", bundle_name)
+        filtered_chunks = cache.get(key)
+        if filtered_chunks is not None:
+            return filtered_chunks
+
+        chunks = assets["chunks"].get(bundle_name, None)
+        if chunks is None:
+            self._raise_lookup_error(
+                bundle_name, "Cannot resolve bundle {0}.".format(bundle_name))
+
+        filtered_chunks = tuple(self.filter_chunks(chunks))
+
+        for chunk in filtered_chunks:
+            asset = assets["assets"][chunk]
+            if asset is None:
+                self._raise_lookup_error(
+                    bundle_name, "Cannot resolve asset {0}.".format(chunk))
+
+        cache[key] = filtered_chunks
+        return filtered_chunks
+
+    def _raise_lookup_error(self, bundle_name, message):
+        error = WebpackBundleLookupError(message)
+        signals.bundle_lookup_failed.send(
+            sender=type(self), loader=self, config=self.name,
+            bundle_name=bundle_name, error=error)
+        raise error
+
+    def get_chunk_urls(self, assets):
+        '''
+        Return the dict caching the URL of each chunk of `assets`, or `None`
+        when `CACHE_CHUNK_URLS` is disabled.
+        '''
+        if not self.config.get("CACHE_CHUNK_URLS", True):
+            return None
+        key = ("chunk_urls", self.config["BUNDLE_DIR_NAME"], get_storage_version())
+        cache = self.get_assets_cache(assets)
+        urls = cache.get(key)
+        if urls is None:
+            urls = cache[key] = {}
+        return urls
+
+    def map_chunk_files_to_url(self, chunks, assets=None):
+        if assets is None:
+            assets = self.get_assets()
         files = assets["assets"]
+        urls = self.get_chunk_urls(assets)
 
         add_integrity = self.config.get("INTEGRITY")
 
         for chunk in chunks:
-            url = self.get_chunk_url(files[chunk])
+            if urls is None:
+                url = self.get_chunk_url(files[chunk])
+            else:
+                url = urls.get(chunk)
+                if url is None:
+                    url = urls[chunk] = self.get_chunk_url(files[chunk])
 
             if add_integrity:
                 yield {
@@ -178,60 +561,180 @@ class WebpackLoader:
         )
         return staticfiles_storage.url(relpath)
 
+    def _get_compile_wait(self, timeout):
+        '''
+        Return the wait for the current compilation, starting the thread that
+        polls the stats file if needed. Called with `_compile_condition` held.
+        '''
+        wait = self._compile_wait
+        if wait is None:
+            deadline = time.monotonic() + timeout if timeout else None
+            wait = self._compile_wait = _CompileWait(deadline)
+            threading.Thread(
+                target=self._poll_compile, args=(wait,),
+                name='webpack-loader-compile-poller', daemon=True,
+            ).start()
+        return wait
+
+    def _wait_for_compile(self, timeout):
+        '''
+        Block until the stats file no longer says "compile" and return it,
+        or return `None` when `timeout` seconds passed first.
+
+        Only one thread per loader polls the stats file. Every other request
+        waiting on the same compilation sleeps on a condition and shares
+        the deadline of the first one.
+        '''
+        condition = self._compile_condition
+        with condition:
+            wait = self._get_compile_wait(timeout)
+            condition.wait_for(lambda: wait.finished)
+        if wait.error is not None:
+            raise wait.error
+        return wait.assets
+
+    async def _await_compile(self, timeout):
+        '''
+        Async version of `_wait_for_compile`, awaiting the same polling
+        thread without blocking the event loop or a thread of its own.
+        '''
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._compile_condition:
+            wait = self._get_compile_wait(timeout)
+            wait.callbacks.append(lambda wait: loop.call_soon_threadsafe(
+                _set_future_result, future, wait))
+        wait = await future
+        if wait.error is not None:
+            raise wait.error
+        return wait.assets
+
+    def _poll_compile(self, wait):
+        'Re-read the stats file until the compilation in `wait` is over.'
+        watcher = self.get_stats_watcher()
+        generation = watcher.generation if watcher else 0
+        assets = error = None
+        try:
+            while True:
+                if watcher:
+                    generation = watcher.wait(
+                        generation, self.config["POLL_INTERVAL"])
+                else:
+                    time.sleep(self.config["POLL_INTERVAL"])
+                assets = self.get_assets()
+                if assets.get("status") != "compile":
+                    break
+                if wait.deadline is not None and \
+                        time.monotonic() >= wait.deadline:
+                    assets = None
+                    break
+        except BaseException as e:
+            error = e
+        with self._compile_condition:
+            wait.assets = assets
+            wait.error = error
+            wait.finished = True
+            self._compile_wait = None
+            self._compile_condition.notify_all()
+        for callback in wait.callbacks:
+            try:
+                callback(wait)
+            except RuntimeError:
+                # The event loop of that waiter was closed
+                pass
+
     def get_bundle(self, bundle_name):
+        started = time.perf_counter()
+        assets = self._get_compiled_assets(bundle_name)
+        bundle = self._resolve_bundle(bundle_name, assets)
+        self._send_bundle_resolved(bundle_name, assets, started)
+        return bundle
+
+    def _get_compiled_assets(self, bundle_name):
+        '''
+        Return the stats to resolve the named bundle from, which may be
+        several bundle names joined for the timeout message.
+        '''
         assets = self.get_assets()
 
         # poll when debugging and block request until bundle is compiled
         # or the build times out
-        if settings.DEBUG:
-            timeout = self.config["TIMEOUT"] or 0
-            timed_out = False
-            start = time.time()
-            while assets["status"] == "compile" and not timed_out:
-                time.sleep(self.config["POLL_INTERVAL"])
-                if timeout and (time.time() - timeout > start):
-                    timed_out = True
-                if not timeout:
-                    warn(
-                        message=_LOADER_POSSIBLE_LIMBO, category=RuntimeWarning
-                    )
-                assets = self.get_assets()
+        if settings.DEBUG and assets["status"] == "compile":
+            timeout = self._get_compile_timeout()
+            started = time.perf_counter()
+            assets = self._wait_for_compile(timeout)
+            self._send_compile_wait(bundle_name, assets, started)
+            if assets is None:
+                self._raise_compile_timeout(bundle_name, timeout)
+        return assets
 
-            if timed_out:
-                raise WebpackLoaderTimeoutError(
-                    "Timed Out. Bundle `{0}` took more than {1} seconds "
-                    "to compile.".format(bundle_name, timeout)
-                )
+    async def aget_bundle(self, bundle_name):
+        '''
+        Async version of `get_bundle`. The stats file is read in a thread and
+        waiting for webpack to compile doesn't block the event loop.
+        '''
+        if type(self).get_bundle is not WebpackLoader.get_bundle:
+            # Keep the behaviour of loaders that customize get_bundle
+            return await sync_to_async(
+                lambda: list(self.get_bundle(bundle_name)),
+                thread_sensitive=False)()
 
-        if assets.get("status") == "done":
-            chunks = assets["chunks"].get(bundle_name, None)
-            if chunks is None:
-                raise WebpackBundleLookupError(
-                    "Cannot resolve bundle {0}.".format(bundle_name)
-                )
+        started = time.perf_counter()
+        assets = await self.aget_assets()
+        if settings.DEBUG and assets["status"] == "compile":
+            timeout = self._get_compile_timeout()
+            wait_started = time.perf_counter()
+            assets = await self._await_compile(timeout)
+            self._send_compile_wait(bundle_name, assets, wait_started)
+            if assets is None:
+                self._raise_compile_timeout(bundle_name, timeout)
+
+        bundle = self._resolve_bundle(bundle_name, assets)
+        self._send_bundle_resolved(bundle_name, assets, started)
+        return bundle
 
-            filtered_chunks = self.filter_chunks(chunks)
+    def _send_bundle_resolved(self, bundle_name, assets, started):
+        if signals.bundle_resolved.receivers:
+            signals.bundle_resolved.send(
+                sender=type(self), loader=self, config=self.name,
+                bundle_name=bundle_name,
+                chunk_count=len(self.get_filtered_chunks(bundle_name, assets)),
+                duration=time.perf_counter() - started)
 
-            for chunk in filtered_chunks:
-                asset = assets["assets"][chunk]
-                if asset is None:
-                    raise WebpackBundleLookupError(
-                        "Cannot resolve asset {0}.".format(chunk)
-                    )
+    def _send_compile_wait(self, bundle_name, assets, started):
+        signals.compile_wait.send(
+            sender=type(self), loader=self, config=self.name,
+            bundle_name=bundle_name, duration=time.perf_counter() - started,
+            timed_out=assets is None)
 
-            return self.map_chunk_files_to_url(filtered_chunks)
+    def _get_compile_timeout(self):
+        timeout = self.config["TIMEOUT"] or 0
+        if not timeout:
+            warn(message=_LOADER_POSSIBLE_LIMBO, category=RuntimeWarning)
+        return timeout
+
+    def _raise_compile_timeout(self, bundle_name, timeout):
+        raise WebpackLoaderTimeoutError(
+            "Timed Out. Bundle `{0}` took more than {1} seconds "
+            "to compile.".format(bundle_name, timeout)
+        )
+
+    def _resolve_bundle(self, bundle_name, assets):
+        '''
+        Return the chunks of the named bundle from the passed `assets`.
+        '''
+        if assets.get("status") == "done":
+            filtered_chunks = self.get_filtered_chunks(bundle_name, assets)
+            return self.map_chunk_files_to_url(filtered_chunks, assets)
 
         elif assets.get("status") == "error":
-            if "file" not in assets:
-                assets["file"] = ""
-            if "error" not in assets:
-                assets["error"] = "Unknown Error"
-            if "message" not in assets:
-                assets["message"] = ""
+            # The stats are shared with other threads, don't modify them
+            details = {"file": "", "error": "Unknown Error", "message": ""}
+            details.update(assets)
             error = """
             {error} in {file}
             {message}
-            """.format(**assets)
+            """.format(**details)
             raise WebpackError(error)
 
         raise WebpackLoaderBadStatsError(
@@ -241,12 +744,361 @@ class WebpackLoader:
         )
 
 
+class CacheBackendWebpackLoader(WebpackLoader):
+    '''
+    A loader reading the stats from a Django cache instead of `STATS_FILE`,
+    for sites running on many servers. The stats are put in the cache by
+    the `publish_webpack_stats` management command.
+
+    The cache holds the version of the stats next to every published
+    version, and they are only fetched when the version changed. With
+    `CACHE` disabled, the version is checked at most every
+    `STATS_CHECK_INTERVAL` seconds, 10 by default. With `CACHE` enabled, the
+    stats are fetched once and new versions need a restart.
+    '''
+    default_check_interval = 10
+    reads_stats_file = False
+
+    def get_stats_cache(self):
+        return caches[self.config.get("STATS_CACHE_ALIAS") or "default"]
+
+    def get_stats_cache_key(self):
+        return self.config.get("STATS_CACHE_KEY") or \
+            "webpack_loader:stats:{0}".format(self.name)
+
+    def publish_stats(self, stats_file=None):
+        '''
+        Put the stats from `stats_file`, `STATS_FILE` by default, in the cache
+        and return their version. The stats of the previous version expire
+        `_PREVIOUS_STATS_TIMEOUT` seconds later.
+        '''
+        with open(stats_file or self.config["STATS_FILE"], "rb") as f:
+            content = f.read()
+        assets = json.loads(content.decode("utf-8"))
+        version = hashlib.sha1(content).hexdigest()
+        key = self.get_stats_cache_key()
+        cache = self.get_stats_cache()
+        version_key = "{0}:version".format(key)
+        previous_version = cache.get(version_key)
+        # Readers may get the new version as soon as it is set, so the
+        # stats must be there first. Caches like memcached silently drop
+        # values larger than they can hold.
+        cache.set("{0}:{1}".format(key, version), assets, timeout=None)
+        if cache.get("{0}:{1}".format(key, version)) is None:
+            raise IOError(_STATS_NOT_STORED.format(
+                self.config.get("STATS_CACHE_ALIAS") or "default", version,
+                self.name))
+        cache.set(version_key, version, timeout=None)
+        if previous_version is not None and previous_version != version:
+            cache.touch(
+                "{0}:{1}".format(key, previous_version),
+                timeout=_PREVIOUS_STATS_TIMEOUT)
+        return version
+
+    def load_assets(self):
+        started = time.perf_counter()
+        key = self.get_stats_cache_key()
+        cached = self._get_stats_file_cache(key)
+        now = time.monotonic()
+        check_interval = self.get_check_interval()
+        if cached is not None and check_interval and \
+                0 <= now - cached.checked_at < check_interval:
+            return self._send_stats_loaded(cached.assets, started)
+
+        cache = self.get_stats_cache()
+        version = cache.get("{0}:version".format(key))
+        if cached is not None and version in (None, cached.signature):
+            # Keep the last stats when the cache lost them, e.g. on restart
+            cached.checked_at = now
+            return self._send_stats_loaded(cached.assets, started)
+        if version is None:
+            raise IOError(_STATS_NOT_PUBLISHED.format(
+                self.name, self.config.get("STATS_CACHE_ALIAS") or "default"))
+
+        with self._stats_lock:
+            cached = self._get_stats_file_cache(key)
+            if cached is not None and cached.signature == version:
+                return self._send_stats_loaded(cached.assets, started)
+            assets = cache.get("{0}:{1}".format(key, version))
+            if assets is None:
+                if cached is not None:
+                    return self._send_stats_loaded(cached.assets, started)
+                raise IOError(_STATS_NOT_PUBLISHED.format(
+                    self.name, self.config.get("STATS_CACHE_ALIAS") or "default"))
+            if self.config.get("COMPACT_STATS"):
+                assets = compact_stats(assets)
+            self._stats_file_cache = _StatsFileCache(
+                path=key, signature=version, digest=None, checked_at=now,
+                assets=assets)
+        return self._send_stats_loaded(assets, started, False)
+
+
+class _ConnectionPool:
+    '''
+    Keeps HTTP connections to one server open between requests, reusing at
+    most `maxsize` idle ones.
+    '''
+
+    def __init__(self, url, timeout, maxsize=4):
+        self.url = url
+        parts = urlsplit(url)
+        if parts.scheme == "https":
+            self.connection_class = http.client.HTTPSConnection
+        else:
+            self.connection_class = http.client.HTTPConnection
+        self.host = parts.netloc
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path = "{0}?{1}".format(self.path, parts.query)
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self._idle = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _get_connection(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections opened before a fork belong to the parent
+                self._idle = []
+                self._pid = os.getpid()
+            if self._idle:
+                return self._idle.pop(), True
+        return self.connection_class(self.host, timeout=self.timeout), False
+
+    def _put_connection(self, connection):
+        with self._lock:
+            if self._pid == os.getpid() and len(self._idle) < self.maxsize:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def get(self, headers):
+        '''Return the status, headers and body of a GET request.'''
+        while True:
+            connection, reused = self._get_connection()
+            try:
+                connection.request("GET", self.path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                if reused:
+                    # The server may have closed an idle connection
+                    continue
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._put_connection(connection)
+            return response.status, response.headers, body
+
+
+class HttpWebpackLoader(WebpackLoader):
+    '''
+    A loader fetching the stats from `STATS_URL` instead of `STATS_FILE`.
+
+    Only the first load waits for the server. Afterwards, stats older than
+    `STATS_CHECK_INTERVAL` seconds, 10 by default, are revalidated by a
+    background thread with `If-None-Match`, and the last stats fetched keep
+    being used until it succeeds.
+    '''
+    default_check_interval = 10
+    reads_stats_file = False
+
+    def __init__(self, name, config):
+        super().__init__(name, config)
+        self._connection_pool = None
+        # The process running a refresh, a forked one doesn't have its thread
+        self._refreshing = None
+
+    def get_connection_pool(self):
+        url = self.config["STATS_URL"]
+        pool = self._connection_pool
+        if pool is None or pool.url != url:
+            pool = self._connection_pool = _ConnectionPool(
+                url, self.config.get("STATS_URL_TIMEOUT"))
+        return pool
+
+    def load_assets(self):
+        started = time.perf_counter()
+        url = self.config["STATS_URL"]
+        cached = self._get_stats_file_cache(url)
+        if cached is None:
+            with self._stats_lock:
+                cached = self._get_stats_file_cache(url)
+                if cached is None:
+                    return self._fetch_stats(url, None, started).assets
+            return self._send_stats_loaded(cached.assets, started)
+
+        check_interval = self.get_check_interval()
+        if not 0 <= time.monotonic() - cached.checked_at < check_interval:
+            self._start_refresh(url)
+        return self._send_stats_loaded(cached.assets, started)
+
+    def _fetch_stats(self, url, cached, started=None):
+        '''
+        Fetch the stats and return the new cache entry, revalidating the
+        `cached` one when there is one.
+        '''
+        if started is None:
+            started = time.perf_counter()
+        headers = {"Accept": "application/json"}
+        if cached is not None and cached.digest:
+            headers["If-None-Match"] = cached.digest
+        try:
+            status, response_headers, body = \
+                self.get_connection_pool().get(headers)
+        except (OSError, http.client.HTTPException) as e:
+            raise IOError(_STATS_URL_ERROR.format(url, e))
+        now = time.monotonic()
+        if status == 304 and cached is not None:
+            assets = cached.assets
+            etag = cached.digest
+        elif status == 200:
+            assets = json.loads(body.decode("utf-8"))
+            if self.config.get("COMPACT_STATS"):
+                assets = compact_stats(assets)
+            etag = response_headers.get("ETag")
+            self._send_stats_loaded(assets, started, False, len(body))
+        else:
+            raise IOError(_STATS_URL_ERROR.format(
+                url, "HTTP status {0}".format(status)))
+        entry = self._stats_file_cache = _StatsFileCache(
+            path=url, signature=None, digest=etag, checked_at=now,
+            assets=assets)
+        return entry
+
+    def _start_refresh(self, url):
+        with self._stats_lock:
+            if self._refreshing == os.getpid():
+                return
+            self._refreshing = os.getpid()
+        threading.Thread(
+            target=self._refresh, args=(url,),
+            name="webpack-loader-stats-refresh", daemon=True,
+        ).start()
+
+    def _refresh(self, url):
+        cached = self._get_stats_file_cache(url)
+        try:
+            self._fetch_stats(url, cached)
+        except (IOError, ValueError) as e:
+            warn(message=str(e), category=RuntimeWarning)
+            if cached is not None:
+                # Try again once STATS_CHECK_INTERVAL passed
+                self._stats_file_cache = _StatsFileCache(
+                    path=url, signature=None, digest=cached.digest,
+                    checked_at=time.monotonic(), assets=cached.assets)
+        finally:
+            with self._stats_lock:
+                self._refreshing = None
+
+
+class StorageWebpackLoader(WebpackLoader):
+    '''
+    A loader reading `STATS_FILE` from a Django storage, like the one the
+    bundles are collected to, instead of the local filesystem.
+
+    The stats are only read again when `get_stats_signature` changes, which
+    is checked at most every `STATS_CHECK_INTERVAL` seconds, 10 by default.
+    When the storage can't be read, the last stats read keep being used.
+    '''
+    default_check_interval = 10
+    reads_stats_file = False
+
+    def __init__(self, name, config):
+        super().__init__(name, config)
+        self._stats_storage = None
+
+    def get_stats_storage(self):
+        '''
+        Return the storage named by `STATS_STORAGE`, an alias of the
+        `STORAGES` setting or the dotted path of a storage class, and the
+        static files storage when it is not set.
+        '''
+        storage_name = self.config.get("STATS_STORAGE")
+        if not storage_name:
+            return staticfiles_storage
+        if "." not in storage_name:
+            from django.core.files.storage import storages
+            return storages[storage_name]
+        storage = self._stats_storage
+        if storage is None or storage[0] != storage_name:
+            storage = self._stats_storage = (
+                storage_name, import_string(storage_name)())
+        return storage[1]
+
+    def get_stats_signature(self, storage, name):
+        '''
+        Return a value that changes when the stats file `name` in `storage`
+        does: its modified time and size. Override it to use e.g. the ETag
+        of an object in an S3 bucket instead.
+        '''
+        try:
+            modified_time = storage.get_modified_time(name)
+        except NotImplementedError:
+            modified_time = None
+        return (modified_time, storage.size(name))
+
+    def load_assets(self):
+        started = time.perf_counter()
+        name = self.config["STATS_FILE"]
+        cached = self._get_stats_file_cache(name)
+        now = time.monotonic()
+        check_interval = self.get_check_interval()
+        if cached is not None and check_interval and \
+                0 <= now - cached.checked_at < check_interval:
+            return self._send_stats_loaded(cached.assets, started)
+
+        storage = self.get_stats_storage()
+        try:
+            assets, cache_hit, size = self._read_stats(
+                storage, name, cached, now)
+        except Exception as e:
+            message = _STATS_STORAGE_ERROR.format(
+                name, type(storage).__name__, e)
+            if cached is None:
+                if isinstance(e, (OSError, ValueError)):
+                    raise IOError(message)
+                raise
+            # Remote storages raise their own errors, like botocore's
+            # ClientError, which must not break rendering either
+            warn(message=message, category=RuntimeWarning)
+            return self._send_stats_loaded(cached.assets, started)
+        return self._send_stats_loaded(assets, started, cache_hit, size)
+
+    def _read_stats(self, storage, name, cached, now):
+        '''
+        Return the stats in `storage`, whether they are the `cached` ones, and
+        the size of new ones.
+        '''
+        signature = self.get_stats_signature(storage, name)
+        if cached is not None and signature == cached.signature:
+            cached.checked_at = now
+            return cached.assets, True, None
+        with self._stats_lock:
+            cached = self._get_stats_file_cache(name)
+            if cached is not None and signature == cached.signature:
+                return cached.assets, True, None
+            with storage.open(name, "rb") as f:
+                content = f.read()
+            assets = json.loads(content.decode("utf-8"))
+            if self.config.get("COMPACT_STATS"):
+                assets = compact_stats(assets)
+            self._stats_file_cache = _StatsFileCache(
+                path=name, signature=signature, digest=None,
+                checked_at=now, assets=assets)
+            return assets, False, len(content)
+
+
 class FakeWebpackLoader(WebpackLoader):
     """
     A fake loader to help run Django tests.
 
     For running tests where `render_bundle` is used but assets aren't built.
     """
+    reads_stats_file = False
 
     def get_assets(self):
         return {}
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...config import get_config_names
+from ...utils import get_loader
+
+
+class Command(BaseCommand):
+    help = (
+        'Write a binary copy of the webpack stats files, loaded instead of '
+        'the JSON when STATS_BINARY_CACHE is enabled.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'configs', nargs='*', metavar='config',
+            help=(
+                'WEBPACK_LOADER configurations to compile, by default those '
+                'with STATS_BINARY_CACHE reading a local STATS_FILE.'))
+
+    def handle(self, *args, **options):
+        config_names = options['configs']
+        if not config_names:
+            loaders = map(get_loader, get_config_names())
+            config_names = [
+                loader.name for loader in loaders
+                if loader.reads_stats_file and
+                loader.config.get('STATS_BINARY_CACHE')]
+        for config_name in config_names:
+            try:
+                path = get_loader(config_name).compile_binary_stats()
+            except KeyError:
+                raise CommandError(
+                    'Unknown WEBPACK_LOADER configuration {0}.'.format(config_name))
+            except (IOError, ValueError) as e:
+                raise CommandError(
+                    'Could not compile the stats of {0}: {1}'.format(config_name, e))
+            self.stdout.write('Wrote {0}'.format(path))
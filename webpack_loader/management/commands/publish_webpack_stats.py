@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...config import get_config_names
+from ...loaders import CacheBackendWebpackLoader
+from ...utils import get_loader
+
+
+class Command(BaseCommand):
+    help = (
+        'Put the webpack stats files in the Django cache, where '
+        'CacheBackendWebpackLoader reads them from.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'configs', nargs='*', metavar='config',
+            help='WEBPACK_LOADER configurations to publish, all using '
+                 'CacheBackendWebpackLoader by default.')
+        parser.add_argument(
+            '--stats-file',
+            help='Publish this stats file instead of STATS_FILE, for a '
+                 'single configuration.')
+
+    def handle(self, *args, **options):
+        config_names = options['configs']
+        stats_file = options['stats_file']
+        if stats_file and len(config_names) != 1:
+            raise CommandError('--stats-file needs exactly one configuration.')
+        if not config_names:
+            config_names = [
+                name for name in get_config_names()
+                if isinstance(get_loader(name), CacheBackendWebpackLoader)
+            ]
+
+        for config_name in config_names:
+            try:
+                loader = get_loader(config_name)
+            except KeyError:
+                raise CommandError(
+                    'Unknown WEBPACK_LOADER configuration {0}.'.format(config_name))
+            if not isinstance(loader, CacheBackendWebpackLoader):
+                raise CommandError(
+                    'The LOADER_CLASS of {0} is not CacheBackendWebpackLoader.'.format(
+                        config_name))
+            try:
+                version = loader.publish_stats(stats_file)
+            except (IOError, ValueError) as e:
+                raise CommandError(
+                    'Could not publish the stats of {0}: {1}'.format(config_name, e))
+            self.stdout.write(
+                'Published version {0} of {1}'.format(version, config_name))
@@ -0,0 +1,228 @@
+'''
+Metrics of the loaders in the Prometheus text exposition format, collected
+from `webpack_loader.signals` for the configurations with `METRICS` enabled.
+'''
+import threading
+from bisect import bisect_left
+
+from django.http import HttpResponse
+
+from . import signals
+
+__all__ = (
+    'CONTENT_TYPE',
+    'Counter',
+    'Histogram',
+    'Registry',
+    'registry',
+    'enable',
+    'disable',
+    'metrics_view',
+)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (
+    .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{{{0}}}'.format(','.join(
+        '{0}="{1}"'.format(name, str(value).replace('\\', '\\\\').replace(
+            '"', '\\"').replace('\n', '\\n'))
+        for name, value in labels))
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        # Label values to the value of the metric for them
+        self._values = {}
+
+    def _get_key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError('{0} takes the labels {1}'.format(
+                self.name, ', '.join(self.labelnames)))
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def collect(self):
+        'Return the lines of the metric in the text exposition format.'
+        lines = [
+            '# HELP {0} {1}'.format(self.name, self.documentation),
+            '# TYPE {0} {1}'.format(self.name, self.type),
+        ]
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.extend(self._collect(list(zip(self.labelnames, key)), value))
+        return lines
+
+
+class Counter(_Metric):
+    'A value that only goes up, like the number of times something happened.'
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._get_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self._values.get(self._get_key(labels), 0)
+
+    def _collect(self, labels, value):
+        yield '{0}{1} {2}'.format(
+            self.name, _format_labels(labels), _format_value(value))
+
+
+class Histogram(_Metric):
+    'Counts observed values, like durations, in buckets of upper bounds.'
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._get_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # The count of each bucket, then the sum of the values
+                counts = self._values[key] = [0] * len(self.buckets) + [0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def get_count(self, **labels):
+        counts = self._values.get(self._get_key(labels))
+        return sum(counts[:-1]) if counts else 0
+
+    def _collect(self, labels, counts):
+        total = 0
+        for bound, count in zip(self.buckets, counts):
+            total += count
+            yield '{0}_bucket{1} {2}'.format(
+                self.name, _format_labels(labels + [('le', _format_value(
+                    float(bound)))]), total)
+        yield '{0}_sum{1} {2}'.format(
+            self.name, _format_labels(labels), _format_value(counts[-1]))
+        yield '{0}_count{1} {2}'.format(
+            self.name, _format_labels(labels), total)
+
+
+class Registry:
+    'A set of metrics rendered together.'
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def clear(self):
+        for metric in self._metrics:
+            metric.clear()
+
+    def render(self):
+        'Return the metrics in the Prometheus text exposition format.'
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+stats_loads = registry.register(Counter(
+    'webpack_loader_stats_loads_total',
+    'Times the stats were checked, by whether they were still current.',
+    ('config', 'result')))
+stats_load_seconds = registry.register(Histogram(
+    'webpack_loader_stats_load_seconds',
+    'Time spent reading or fetching, and parsing new stats.', ('config',)))
+tag_cache = registry.register(Counter(
+    'webpack_loader_tag_cache_total',
+    'Bundles rendered, by whether their tags were already built.',
+    ('config', 'result')))
+render_seconds = registry.register(Histogram(
+    'webpack_loader_render_seconds',
+    'Time spent rendering the tags of bundles.', ('config',)))
+compile_wait_seconds = registry.register(Histogram(
+    'webpack_loader_compile_wait_seconds',
+    'Time requests waited for webpack to compile.',
+    ('config', 'timed_out')))
+lookup_errors = registry.register(Counter(
+    'webpack_loader_bundle_lookup_errors_total',
+    'Bundles or chunks that could not be found in the stats.', ('config',)))
+
+
+def _get_result(cache_hit):
+    return 'hit' if cache_hit else 'miss'
+
+
+def _on_stats_loaded(sender, loader, config, cache_hit, duration, **kwargs):
+    if loader.config.get('METRICS'):
+        stats_loads.inc(config=config, result=_get_result(cache_hit))
+        if not cache_hit:
+            stats_load_seconds.observe(duration, config=config)
+
+
+def _on_bundle_rendered(sender, loader, config, cache_hit, duration, **kwargs):
+    if loader.config.get('METRICS'):
+        tag_cache.inc(config=config, result=_get_result(cache_hit))
+        render_seconds.observe(duration, config=config)
+
+
+def _on_compile_wait(sender, loader, config, duration, timed_out, **kwargs):
+    if loader.config.get('METRICS'):
+        compile_wait_seconds.observe(
+            duration, config=config, timed_out=str(timed_out).lower())
+
+
+def _on_bundle_lookup_failed(sender, loader, config, **kwargs):
+    if loader.config.get('METRICS'):
+        lookup_errors.inc(config=config)
+
+
+_RECEIVERS = (
+    (signals.stats_loaded, _on_stats_loaded),
+    (signals.bundle_rendered, _on_bundle_rendered),
+    (signals.compile_wait, _on_compile_wait),
+    (signals.bundle_lookup_failed, _on_bundle_lookup_failed),
+)
+
+
+def enable():
+    'Start collecting the metrics, done at startup when a config has `METRICS`.'
+    for signal, receiver in _RECEIVERS:
+        signal.connect(
+            receiver, dispatch_uid=__name__ + '.' + receiver.__name__)
+
+
+def disable():
+    for signal, receiver in _RECEIVERS:
+        signal.disconnect(
+            receiver, dispatch_uid=__name__ + '.' + receiver.__name__)
+
+
+def metrics_view(request):
+    'A view returning the metrics for Prometheus to scrape.'
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
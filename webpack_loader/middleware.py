@@ -0,0 +1,190 @@
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+from django.utils.deprecation import MiddlewareMixin
+
+from . import signals
+
+__all__ = (
+    'get_preload_links',
+    'PreloadLinkHeaderMiddleware',
+    'EarlyHintsMiddleware',
+    'ServerTimingMiddleware',
+)
+
+# Chunk extensions to the `as` attribute of their preload link
+_PRELOAD_TYPES = (
+    (('.css', '.css.gz'), 'style'),
+    (('.js', '.js.gz'), 'script'),
+)
+
+
+def get_preload_links(urls):
+    '''
+    Return `Link` header values preloading the chunks at `urls`, styles
+    first. URLs of other files are left out.
+    '''
+    links = []
+    for index, (extensions, as_) in enumerate(_PRELOAD_TYPES):
+        for url in urls:
+            if urlsplit(url).path.endswith(extensions):
+                links.append((index, url, as_))
+    return [
+        '<{0}>; rel=preload; as={1}'.format(url, as_)
+        for _index, url, as_ in sorted(links)
+    ]
+
+
+class PreloadLinkHeaderMiddleware(MiddlewareMixin):
+    '''
+    Add a `Link` header preloading the chunks rendered by `render_bundle` and
+    `render_bundles` for the response, so that browsers and proxies can
+    start fetching them before parsing the page.
+    '''
+
+    def get_links(self, request):
+        return get_preload_links(
+            getattr(request, '_webpack_loader_used_urls', None) or ())
+
+    def process_response(self, request, response):
+        links = self.get_links(request)
+        if links:
+            existing = response.get('Link')
+            response['Link'] = ', '.join(
+                [existing] + links if existing else links)
+        return response
+
+
+class EarlyHintsMiddleware(PreloadLinkHeaderMiddleware):
+    '''
+    Same as `PreloadLinkHeaderMiddleware`, also sending the links of the
+    last successful response of a view in a `103 Early Hints` response,
+    before that view runs again.
+
+    Early hints are sent through the `wsgi.early_hints` callable that some
+    WSGI servers add to the environ. Override `send_early_hints` for other
+    servers.
+    '''
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        # View functions to the links of their last successful response
+        self.view_links = {}
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._webpack_loader_view = view_func
+        links = self.view_links.get(view_func)
+        if links:
+            self.send_early_hints(request, links)
+
+    def process_response(self, request, response):
+        response = super().process_response(request, response)
+        view_func = getattr(request, '_webpack_loader_view', None)
+        if view_func is not None and 200 <= response.status_code < 300:
+            links = self.get_links(request)
+            if links:
+                self.view_links[view_func] = links
+            else:
+                self.view_links.pop(view_func, None)
+        return response
+
+    def send_early_hints(self, request, links):
+        early_hints = request.META.get('wsgi.early_hints')
+        if callable(early_hints):
+            early_hints([('Link', link) for link in links])
+
+
+class _Timings:
+    'Time spent in the loaders while handling one request, in seconds.'
+    __slots__ = (
+        'stats_checks', 'stats_reads', 'stats', 'bundles', 'bundle',
+        'renders', 'render', 'compile_waits', 'compile_wait')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def get_entries(self):
+        'Return the `Server-Timing` header values for these timings.'
+        entries = []
+        for name, duration, count, desc in (
+                ('webpack-stats', self.stats, self.stats_checks,
+                 '{0} reads of {1} checks'.format(
+                     self.stats_reads, self.stats_checks)),
+                ('webpack-bundle', self.bundle, self.bundles,
+                 '{0} bundles resolved'.format(self.bundles)),
+                ('webpack-render', self.render, self.renders,
+                 '{0} bundles rendered'.format(self.renders)),
+                ('webpack-compile', self.compile_wait, self.compile_waits,
+                 'waited for webpack to compile')):
+            if count:
+                entries.append('{0};dur={1:.2f};desc="{2}"'.format(
+                    name, duration * 1000, desc))
+        return entries
+
+
+# The timings of the request being handled, if any
+_timings = ContextVar('webpack_loader_timings', default=None)
+
+
+def _on_stats_loaded(sender, cache_hit, duration, **kwargs):
+    timings = _timings.get()
+    if timings is not None:
+        timings.stats_checks += 1
+        if not cache_hit:
+            timings.stats_reads += 1
+        timings.stats += duration
+
+
+def _on_bundle_resolved(sender, duration, **kwargs):
+    timings = _timings.get()
+    if timings is not None:
+        timings.bundles += 1
+        timings.bundle += duration
+
+
+def _on_bundle_rendered(sender, duration, **kwargs):
+    timings = _timings.get()
+    if timings is not None:
+        timings.renders += 1
+        timings.render += duration
+
+
+def _on_compile_wait(sender, duration, **kwargs):
+    timings = _timings.get()
+    if timings is not None:
+        timings.compile_waits += 1
+        timings.compile_wait += duration
+
+
+class ServerTimingMiddleware(MiddlewareMixin):
+    '''
+    Add a `Server-Timing` header with the time spent in the loaders for the
+    response: loading stats, resolving and rendering bundles and waiting for
+    webpack to compile, along with how many times the stats were read.
+    Browsers show it next to the request in their developer tools.
+    '''
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        for signal, receiver in (
+                (signals.stats_loaded, _on_stats_loaded),
+                (signals.bundle_resolved, _on_bundle_resolved),
+                (signals.bundle_rendered, _on_bundle_rendered),
+                (signals.compile_wait, _on_compile_wait)):
+            signal.connect(
+                receiver, dispatch_uid=__name__ + '.' + receiver.__name__)
+
+    def process_request(self, request):
+        request._webpack_loader_timings = _Timings()
+        _timings.set(request._webpack_loader_timings)
+
+    def process_response(self, request, response):
+        _timings.set(None)
+        timings = getattr(request, '_webpack_loader_timings', None)
+        entries = timings.get_entries() if timings is not None else None
+        if entries:
+            existing = response.get('Server-Timing')
+            response['Server-Timing'] = ', '.join(
+                [existing] + entries if existing else entries)
+        return response
@@ -1 +1,42 @@
-# will hook into collectstatic
+from django.dispatch import Signal
+
+__all__ = (
+    'stats_loaded',
+    'bundle_resolved',
+    'bundle_lookup_failed',
+    'bundle_rendered',
+    'compile_wait',
+)
+
+# Sent each time a loader checks its stats, with the loader class as sender
+# and the keyword arguments:
+# - loader, config: the loader and the name of its configuration
+# - cache_hit: False when new stats were read, True when the stats in memory
+#   were still current
+# - size: the size in bytes of the stats read, or None
+# - duration: the seconds spent checking, reading or fetching, and parsing
+#   the stats, including waiting for other threads doing so
+# - chunk_count, asset_count: the number of bundles and assets in the stats
+stats_loaded = Signal()
+
+# Sent when a loader resolved the chunks of a bundle, with the loader class as
+# sender and the keyword arguments loader, config, bundle_name, chunk_count
+# and duration, the seconds spent since `get_bundle` was called
+bundle_resolved = Signal()
+
+# Sent before a `WebpackBundleLookupError` is raised, with the loader class as
+# sender and the keyword arguments loader, config, bundle_name and error
+bundle_lookup_failed = Signal()
+
+# Sent when the tags of a bundle were rendered, with the loader class as
+# sender and the keyword arguments loader, config, bundle_name, extension,
+# chunk_count, the number of tags, cache_hit, True when the tags were built
+# for an earlier render of the same stats, and duration, in seconds. Bundles
+# rendered together by `render_bundles` are sent once, their names joined by
+# commas.
+bundle_rendered = Signal()
+
+# Sent when a request stopped waiting for webpack to finish compiling, with
+# the loader class as sender and the keyword arguments loader, config,
+# bundle_name, duration, the seconds waited, and timed_out
+compile_wait = Signal()
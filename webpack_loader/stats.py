@@ -0,0 +1,80 @@
+import sys
+
+__all__ = ('Asset', 'compact_stats')
+
+
+class Asset:
+    '''
+    A read-only asset entry of a stats file, holding only the keys the loader
+    uses. It supports the same lookups as the dict it replaces, e.g.
+    `asset["name"]` and `asset.get("integrity")`.
+    '''
+    __slots__ = ('name', 'publicPath', 'integrity', 'sourceFilename')
+
+    def __init__(
+            self, name, publicPath=None, integrity=None, sourceFilename=None):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'publicPath', publicPath)
+        object.__setattr__(self, 'integrity', integrity)
+        object.__setattr__(self, 'sourceFilename', sourceFilename)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('Asset entries are read-only')
+
+    def __getitem__(self, key):
+        if key not in self.__slots__ or getattr(self, key) is None:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def __eq__(self, other):
+        if isinstance(other, Asset):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return 'Asset({0!r})'.format(self.to_dict())
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def to_dict(self):
+        return {
+            key: getattr(self, key) for key in self.__slots__
+            if getattr(self, key) is not None
+        }
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def compact_stats(stats):
+    '''
+    Return a smaller copy of parsed `stats` for a successful build: chunk
+    lists become tuples, assets become `Asset` entries and repeated strings
+    like chunk names are shared. Other stats are returned unchanged.
+    '''
+    if stats.get('status') != 'done':
+        return stats
+
+    compacted = {
+        key: value for key, value in stats.items()
+        if key not in ('chunks', 'assets')
+    }
+    compacted['chunks'] = {
+        _intern(name): tuple(_intern(chunk) for chunk in chunks)
+        for name, chunks in stats.get('chunks', {}).items()
+    }
+    compacted['assets'] = {
+        _intern(name): Asset(
+            _intern(asset['name']),
+            publicPath=_intern(asset.get('publicPath')),
+            integrity=asset.get('integrity'),
+            sourceFilename=asset.get('sourceFilename'),
+        )
+        for name, asset in stats.get('assets', {}).items()
+    }
+    return compacted
@@ -1,8 +1,11 @@
+import time
+from inspect import getfullargspec, unwrap
 from typing import Optional
 from warnings import warn
 
 from django.http.request import HttpRequest
-from django.template import Library
+from django.template import Library, Variable
+from django.template.library import SimpleNode, parse_bits
 from django.utils.safestring import mark_safe
 
 from .. import utils
@@ -13,29 +16,225 @@ _WARNING_MESSAGE = (
     'doesn\'t have a request. django_webpack_loader needs a request object to '
     'filter out duplicate chunks. Please see https://github.com/django-webpack'
     '/django-webpack-loader#use-skip_common_chunks-on-render_bundle')
+_NOT_LITERAL = object()
+_LITERAL_NAMES = {'True': True, 'False': False, 'None': None}
 
 
-@register.simple_tag(takes_context=True)
 def render_bundle(
         context, bundle_name, extension=None, config='DEFAULT', suffix='',
         attrs='', is_preload=False, skip_common_chunks=None):
-    if skip_common_chunks is None:
-        skip_common_chunks = utils.get_skip_common_chunks(config)
-
     request: Optional[HttpRequest] = context.get('request')
     tags = utils.get_as_url_to_tag_dict(
         bundle_name, request=request, extension=extension, config=config,
         suffix=suffix, attrs=attrs, is_preload=is_preload)
+    return _join_tags(request, tags, config, skip_common_chunks)
+
+
+def _get_literal(filter_expression):
+    '''
+    Return the value of a template argument that doesn't depend on the
+    context, or `_NOT_LITERAL`.
+    '''
+    if filter_expression.filters:
+        return _NOT_LITERAL
+    var = filter_expression.var
+    if not isinstance(var, Variable):
+        return var
+    if var.literal is not None and not var.translate:
+        return var.literal
+    if var.lookups is not None and len(var.lookups) == 1:
+        return _LITERAL_NAMES.get(var.lookups[0], _NOT_LITERAL)
+    return _NOT_LITERAL
+
+
+class BundleFragment:
+    '''
+    The output of `render_bundle` for fixed arguments. The tags are built
+    once per stats version, leaving only the request dependent attributes
+    and de-duplication to each render.
+    '''
+
+    def __init__(
+            self, bundle_name, extension=None, config='DEFAULT', suffix='',
+            attrs='', is_preload=False, skip_common_chunks=None):
+        self.bundle_name = bundle_name
+        self.extension = extension
+        self.config = config
+        self.suffix = suffix
+        self.attrs = attrs
+        self.is_preload = is_preload
+        self.skip_common_chunks = skip_common_chunks
+        # The stats, loader and tag options the tags below were built for
+        self._tags = None
+
+    def _get_loader_and_key(self):
+        loader = utils.get_loader(self.config)
+        key = utils._get_tags_key(
+            loader.config, self.bundle_name, self.extension, self.suffix,
+            self.attrs, self.is_preload)
+        return loader, key
+
+    def _get_tags(self, loader, key, assets):
+        cached = self._tags
+        if key is None or cached is None or cached[0] is not assets or \
+                cached[1] is not loader or cached[2] != key:
+            return None
+        return cached
+
+    def _set_tags(self, loader, key, assets, compiled):
+        html = None
+        if all(tail is None for _, _, _, tail in compiled):
+            html = mark_safe('\n'.join(head for _, _, head, _ in compiled))
+        urls = tuple(url for url, _, _, _ in compiled)
+        cached = (assets, loader, key, compiled, html, urls)
+        if key is not None:
+            self._tags = cached
+        return cached
+
+    def _join(self, loader, cached, request):
+        compiled, html, urls = cached[3:]
+        skip_common_chunks = self.skip_common_chunks
+        if skip_common_chunks is None:
+            skip_common_chunks = utils.get_skip_common_chunks(self.config)
+        if html is None or (request is not None and skip_common_chunks):
+            tags = utils._render_tags(loader, compiled, request, self.attrs)
+            return _join_tags(request, tags, self.config, skip_common_chunks)
+        if request is None:
+            if skip_common_chunks:
+                warn(message=_WARNING_MESSAGE, category=RuntimeWarning)
+        else:
+            _get_used_urls(request).update(urls)
+        return html
+
+    def _render(self, loader, cached, cache_hit, request, started):
+        output = self._join(loader, cached, request)
+        utils._send_bundle_rendered(
+            loader, self.bundle_name, self.extension, len(cached[5]),
+            cache_hit, started)
+        return output
+
+    def render(self, request: Optional[HttpRequest]):
+        started = time.perf_counter()
+        loader, key = self._get_loader_and_key()
+        assets = loader.get_assets()
+        cached = self._get_tags(loader, key, assets)
+        cache_hit = cached is not None
+        if cached is None:
+            compiled, cache_hit = utils._get_compiled_tags(
+                loader, self.bundle_name, self.extension, self.suffix,
+                self.attrs, self.is_preload)
+            cached = self._set_tags(loader, key, assets, compiled)
+        return self._render(loader, cached, cache_hit, request, started)
+
+    async def arender(self, request: Optional[HttpRequest]):
+        '''Async version of `render`'''
+        started = time.perf_counter()
+        loader, key = self._get_loader_and_key()
+        assets = await loader.aget_assets()
+        cached = self._get_tags(loader, key, assets)
+        cache_hit = cached is not None
+        if cached is None:
+            compiled, cache_hit = await utils._aget_compiled_tags(
+                loader, self.bundle_name, self.extension, self.suffix,
+                self.attrs, self.is_preload)
+            cached = self._set_tags(loader, key, assets, compiled)
+        return self._render(loader, cached, cache_hit, request, started)
+
+
+class RenderBundleNode(SimpleNode):
+    '''
+    Renders `render_bundle`. When every argument is a literal, they are
+    bound once to a `BundleFragment`.
+    '''
+
+    def __init__(self, func, takes_context, args, kwargs, target_var):
+        super().__init__(func, takes_context, args, kwargs, target_var)
+        self.fragment = None
+        values = [_get_literal(arg) for arg in args]
+        keywords = {
+            name: _get_literal(arg) for name, arg in kwargs.items()}
+        if _NOT_LITERAL not in values and \
+                _NOT_LITERAL not in keywords.values():
+            self.fragment = BundleFragment(*values, **keywords)
+
+    def render(self, context):
+        if self.fragment is None:
+            return super().render(context)
+        output = self.fragment.render(context.get('request'))
+        if self.target_var is not None:
+            context[self.target_var] = output
+            return ''
+        return output
+
+
+@register.tag(name='render_bundle')
+def do_render_bundle(parser, token):
+    '''
+    Compile `{% render_bundle %}`, which takes the same arguments as the
+    `render_bundle` function and an optional `as <variable>`.
+    '''
+    bits = token.split_contents()[1:]
+    target_var = None
+    if len(bits) >= 2 and bits[-2] == 'as':
+        target_var = bits[-1]
+        bits = bits[:-2]
+    (params, varargs, varkw, defaults, kwonly, kwonly_defaults,
+     _annotations) = getfullargspec(unwrap(render_bundle))
+    args, kwargs = parse_bits(
+        parser, bits, params, varargs, varkw, defaults, kwonly,
+        kwonly_defaults, True, 'render_bundle')
+    return RenderBundleNode(render_bundle, True, args, kwargs, target_var)
+
+
+@register.simple_tag(takes_context=True)
+def render_bundles(
+        context, *bundle_names, extension=None, config='DEFAULT', suffix='',
+        attrs='', is_preload=False, skip_common_chunks=None):
+    """
+    Renders the tags of several bundles at once, CSS first, then JS.
+    Chunks shared by the bundles are only rendered once.
+    Example usage::
+
+        {% render_bundles 'vendor' 'main' %}
+        {% render_bundles 'vendor' 'main' extension='css' %}
+    """
+    request: Optional[HttpRequest] = context.get('request')
+    extensions = (extension,) if extension else ('css', 'js')
+    tags = utils.get_as_url_to_tag_dict_many(
+        bundle_names, request=request, extensions=extensions, config=config,
+        suffix=suffix, attrs=attrs, is_preload=is_preload)
+    return _join_tags(request, tags, config, skip_common_chunks)
 
-    if request is None:
-        if skip_common_chunks:
-            warn(message=_WARNING_MESSAGE, category=RuntimeWarning)
-        return mark_safe('\n'.join(tags.values()))
 
+async def arender_bundle(
+        context, bundle_name, extension=None, config='DEFAULT', suffix='',
+        attrs='', is_preload=False, skip_common_chunks=None):
+    '''Async version of `render_bundle`, for async template engines'''
+    request: Optional[HttpRequest] = context.get('request')
+    tags = await utils.aget_as_url_to_tag_dict(
+        bundle_name, request=request, extension=extension, config=config,
+        suffix=suffix, attrs=attrs, is_preload=is_preload)
+    return _join_tags(request, tags, config, skip_common_chunks)
+
+
+def _get_used_urls(request):
     used_urls = getattr(request, '_webpack_loader_used_urls', None)
     if used_urls is None:
         used_urls = set()
         setattr(request, '_webpack_loader_used_urls', used_urls)
+    return used_urls
+
+
+def _join_tags(request, tags, config, skip_common_chunks):
+    if skip_common_chunks is None:
+        skip_common_chunks = utils.get_skip_common_chunks(config)
+
+    if request is None:
+        if skip_common_chunks:
+            warn(message=_WARNING_MESSAGE, category=RuntimeWarning)
+        return mark_safe('\n'.join(tags.values()))
+
+    used_urls = _get_used_urls(request)
     if skip_common_chunks:
         tags = {url: tag for url, tag in tags.items() if url not in used_urls}
     used_urls.update(tags)
@@ -52,6 +251,22 @@ def webpack_asset(asset_name, config='DEFAULT'):
     return utils.get_asset(asset_name, config=config)
 
 
+@register.simple_tag
+def webpack_assets(*asset_names, config='DEFAULT'):
+    """
+    Resolves several assets by their source filename in one go.
+    Example usage::
+
+        {% webpack_assets 'icons/add.svg' 'icons/remove.svg' as icons %}
+        {% for icon in icons %}<img src="{{ icon }}"/>{% endfor %}
+
+    :param asset_names: The source filenames of the assets
+    :param config: (optional) the name of the configuration
+    :return: a list with the URL of each asset, or `None` when not found
+    """
+    return utils.get_asset_urls(asset_names, config=config)
+
+
 @register.simple_tag(takes_context=True)
 def get_files(
         context, bundle_name, extension=None, config='DEFAULT',
@@ -70,11 +285,23 @@ def get_files(
     :param skip_common_chunks: (optional) `True` if you want to skip returning already rendered common chunks
     :return: a list of matching chunks
     """
+    result = utils.get_files(bundle_name, extension=extension, config=config)
+    return _filter_files(context, result, config, skip_common_chunks)
+
+
+async def aget_files(
+        context, bundle_name, extension=None, config='DEFAULT',
+        skip_common_chunks=None):
+    '''Async version of `get_files`, for async template engines'''
+    result = await utils.aget_files(
+        bundle_name, extension=extension, config=config)
+    return _filter_files(context, result, config, skip_common_chunks)
+
+
+def _filter_files(context, result, config, skip_common_chunks):
     if skip_common_chunks is None:
         skip_common_chunks = utils.get_skip_common_chunks(config)
 
-    result = utils.get_files(bundle_name, extension=extension, config=config)
-
     request = context.get('request')
     if request is None:
         if skip_common_chunks:
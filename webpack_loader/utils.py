@@ -1,12 +1,16 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from importlib import import_module
-from typing import Optional, OrderedDict
+from typing import NamedTuple, Optional, OrderedDict
 
 from django.conf import settings
 from django.http.request import HttpRequest
 
-from .config import load_config
-from .loaders import WebpackLoader
+from . import signals
+from .config import get_config_names, load_config
+from .loaders import WebpackLoader, get_storage_version
 
 
 def import_string(dotted_path):
@@ -39,6 +43,70 @@ def get_skip_common_chunks(config_name):
     return loader.config.get('SKIP_COMMON_CHUNKS', False)
 
 
+def preload(config_names=None):
+    '''
+    Load the stats of several configurations in parallel, ahead of the first
+    requests that need them.
+
+    :param config_names: (optional) the names of the configurations, all by default
+    :return: a dict of configuration names to the error raised while loading them
+    '''
+    if config_names is None:
+        config_names = get_config_names()
+    loaders = {name: get_loader(name) for name in config_names}
+    errors = {}
+    if not loaders:
+        return errors
+
+    with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+        futures = {
+            name: executor.submit(loader.preload)
+            for name, loader in loaders.items()
+        }
+    for name, future in futures.items():
+        error = future.exception()
+        if error is not None:
+            errors[name] = error
+    return errors
+
+
+class PreloadReport(NamedTuple):
+    # Configuration names to the error raised while loading their stats
+    errors: dict
+    # Estimated size of the loaded stats, shared by forked worker processes
+    shared_bytes: int
+
+
+def get_stats_size(config_names=None):
+    '''
+    Estimate the memory used by the stats loaded for several configurations.
+
+    :param config_names: (optional) the names of the configurations, all by default
+    :return: the size in bytes
+    '''
+    if config_names is None:
+        config_names = get_config_names()
+    seen = set()
+    size = 0
+    pending = []
+    for name in config_names:
+        loader = get_loader(name)
+        pending.append(loader.get_assets())
+        pending.append(loader.get_assets_cache(pending[-1]))
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            pending.extend(obj)
+    return size
+
+
 def _filter_by_extension(bundle, extension):
     '''Return only files with the given extension'''
     for chunk in bundle:
@@ -59,6 +127,191 @@ def get_files(bundle_name, extension=None, config='DEFAULT'):
     return list(_get_bundle(loader, bundle_name, extension))
 
 
+async def aget_files(bundle_name, extension=None, config='DEFAULT'):
+    '''Async version of `get_files`, for async views'''
+    loader = get_loader(config)
+    bundle = await loader.aget_bundle(bundle_name)
+    if extension:
+        bundle = _filter_by_extension(bundle, extension)
+    return list(bundle)
+
+
+def _compile_tags(config, bundle, suffix, attrs, is_preload):
+    '''
+    Return `(url, chunk, head, tail)` tuples for the tags of the chunks in
+    `bundle`.
+
+    When `tail` is `None`, `head` is the complete tag. Otherwise the tag
+    still needs its request dependent integrity and nonce attributes, which
+    go between `head` and `tail`.
+    '''
+    per_request = config.get('INTEGRITY') or config.get('CSP_NONCE')
+    compiled = []
+
+    for chunk in bundle:
+        url = chunk['url']
+        src = ''.join([url, suffix])
+        if chunk['name'].endswith(('.js', '.js.gz')):
+            if is_preload:
+                compiled.append((url, chunk, (
+                    '<link rel="preload" as="script" href="{0}" {1}/>'
+                ).format(src, attrs), None))
+                continue
+            head = '<script src="{0}"'.format(src)
+            tail = '{0}></script>'.format(attrs)
+        elif chunk['name'].endswith(('.css', '.css.gz')):
+            head = '<link href="{0}" rel={1}'.format(
+                src,
+                '"stylesheet"' if not is_preload else '"preload" as="style"')
+            tail = '{0}/>'.format(attrs)
+        else:
+            continue
+        if per_request:
+            compiled.append((url, chunk, head, tail))
+        else:
+            compiled.append((url, chunk, ''.join([head, ' ', tail]), None))
+    return tuple(compiled)
+
+
+def _get_tags_key(config, bundle_name, extension, suffix, attrs, is_preload):
+    '''
+    Return the key of the compiled tags in the stats cache, or `None` when
+    they contain URLs that must not be cached.
+    '''
+    if not config.get('CACHE_CHUNK_URLS', True):
+        return None
+    return (
+        'tags', bundle_name, extension, suffix, attrs, is_preload,
+        bool(config.get('INTEGRITY')), bool(config.get('CSP_NONCE')),
+        config.get('BUNDLE_DIR_NAME'), get_storage_version())
+
+
+# How many tag variants to keep per stats version, as `attrs` and `suffix` may
+# differ on every render
+_TAGS_CACHE_SIZE = 256
+
+
+def _get_tags_cache(loader, assets):
+    '''
+    Return the dict of compiled tags for `assets`, which only keeps the
+    `_TAGS_CACHE_SIZE` most recently used.
+    '''
+    cache = loader.get_assets_cache(assets)
+    tags_cache = cache.get('tags')
+    if tags_cache is None:
+        tags_cache = cache.setdefault('tags', OrderedDict())
+    return tags_cache
+
+
+def _get_cached_tags(tags_cache, key):
+    compiled = tags_cache.get(key)
+    if compiled is not None:
+        try:
+            tags_cache.move_to_end(key)
+        except KeyError:
+            # Evicted by another thread
+            pass
+    return compiled
+
+
+def _set_cached_tags(tags_cache, key, compiled):
+    tags_cache[key] = compiled
+    while len(tags_cache) > _TAGS_CACHE_SIZE:
+        try:
+            tags_cache.popitem(last=False)
+        except KeyError:
+            break
+    return compiled
+
+
+def _get_compiled_tags(
+        loader, bundle_name, extension, suffix, attrs, is_preload):
+    '''
+    Return the `_compile_tags` output, computed once per stats version and
+    tag options, and whether it was already computed.
+    '''
+    key = _get_tags_key(
+        loader.config, bundle_name, extension, suffix, attrs, is_preload)
+    if key is None:
+        return _compile_tags(
+            loader.config, _get_bundle(loader, bundle_name, extension),
+            suffix, attrs, is_preload), False
+    cache = _get_tags_cache(loader, loader.get_assets())
+    compiled = _get_cached_tags(cache, key)
+    if compiled is not None:
+        return compiled, True
+    return _set_cached_tags(cache, key, _compile_tags(
+        loader.config, _get_bundle(loader, bundle_name, extension),
+        suffix, attrs, is_preload)), False
+
+
+def _get_snapshot_tags(
+        loader, assets, bundle_name, extension, suffix, attrs, is_preload):
+    '''
+    Same as `_get_compiled_tags`, resolving the bundle from the passed
+    `assets` instead of the current stats.
+    '''
+    key = _get_tags_key(
+        loader.config, bundle_name, extension, suffix, attrs, is_preload)
+    cache = OrderedDict()
+    if key is not None:
+        cache = _get_tags_cache(loader, assets)
+    compiled = _get_cached_tags(cache, key)
+    if compiled is not None:
+        return compiled, True
+    bundle = loader._resolve_bundle(bundle_name, assets)
+    if extension:
+        bundle = _filter_by_extension(bundle, extension)
+    return _set_cached_tags(cache, key, _compile_tags(
+        loader.config, bundle, suffix, attrs, is_preload)), False
+
+
+async def _aget_compiled_tags(
+        loader, bundle_name, extension, suffix, attrs, is_preload):
+    '''Async version of `_get_compiled_tags`'''
+    key = _get_tags_key(
+        loader.config, bundle_name, extension, suffix, attrs, is_preload)
+    cache = OrderedDict()
+    if key is not None:
+        cache = _get_tags_cache(loader, await loader.aget_assets())
+    compiled = _get_cached_tags(cache, key)
+    if compiled is not None:
+        return compiled, True
+    bundle = await loader.aget_bundle(bundle_name)
+    if extension:
+        bundle = _filter_by_extension(bundle, extension)
+    return _set_cached_tags(cache, key, _compile_tags(
+        loader.config, bundle, suffix, attrs, is_preload)), False
+
+
+def _render_tags(loader, compiled, request, attrs) -> OrderedDict[str, str]:
+    '''Return a dict of URLs to tags from the `_compile_tags` output.'''
+    result = OrderedDict[str, str]()
+    attrs_l = attrs.lower()
+
+    for url, chunk, head, tail in compiled:
+        if tail is None:
+            result[url] = head
+        else:
+            result[url] = ''.join([
+                head,
+                loader.get_integrity_attr(chunk, request, attrs_l),
+                loader.get_nonce_attr(chunk, request, attrs_l),
+                tail,
+            ])
+    return result
+
+
+def _send_bundle_rendered(
+        loader, bundle_name, extension, chunk_count, cache_hit, started):
+    if signals.bundle_rendered.receivers:
+        signals.bundle_rendered.send(
+            sender=type(loader), loader=loader, config=loader.name,
+            bundle_name=bundle_name, extension=extension,
+            chunk_count=chunk_count, cache_hit=cache_hit,
+            duration=time.perf_counter() - started)
+
+
 def get_as_url_to_tag_dict(
     bundle_name, request: Optional[HttpRequest] = None, extension=None,
     config='DEFAULT', suffix='', attrs='', is_preload=False
@@ -73,37 +326,14 @@ def get_as_url_to_tag_dict(
     :return: a dict of URLs to formatted tags as strings
     '''
 
+    started = time.perf_counter()
     loader = get_loader(config)
-    bundle = _get_bundle(loader, bundle_name, extension)
-    result = OrderedDict[str, str]()
-    attrs_l = attrs.lower()
-
-    for chunk in bundle:
-        if chunk['name'].endswith(('.js', '.js.gz')):
-            if is_preload:
-                result[chunk['url']] = (
-                    '<link rel="preload" as="script" href="{0}" {1}/>'
-                ).format(''.join([chunk['url'], suffix]), attrs)
-            else:
-                result[chunk['url']] = (
-                    '<script src="{0}"{2}{3}{1}></script>'
-                ).format(
-                    ''.join([chunk['url'], suffix]),
-                    attrs,
-                    loader.get_integrity_attr(chunk, request, attrs_l),
-                    loader.get_nonce_attr(chunk, request, attrs_l),
-                )
-        elif chunk['name'].endswith(('.css', '.css.gz')):
-            result[chunk['url']] = (
-                '<link href="{0}" rel={2}{3}{4}{1}/>'
-            ).format(
-                ''.join([chunk['url'], suffix]),
-                attrs,
-                '"stylesheet"' if not is_preload else '"preload" as="style"',
-                loader.get_integrity_attr(chunk, request, attrs_l),
-                loader.get_nonce_attr(chunk, request, attrs_l),
-            )
-    return result
+    compiled, cache_hit = _get_compiled_tags(
+        loader, bundle_name, extension, suffix, attrs, is_preload)
+    tags = _render_tags(loader, compiled, request, attrs)
+    _send_bundle_rendered(
+        loader, bundle_name, extension, len(tags), cache_hit, started)
+    return tags
 
 
 def get_as_tags(
@@ -121,6 +351,100 @@ def get_as_tags(
     return list(get_as_url_to_tag_dict(bundle_name, request, extension, config, suffix, attrs, is_preload).values())
 
 
+def get_as_url_to_tag_dict_many(
+    bundle_names, request: Optional[HttpRequest] = None,
+    extensions=('css', 'js'), config='DEFAULT', suffix='', attrs='',
+    is_preload=False
+) -> OrderedDict[str, str]:
+    '''
+    Same as `get_as_url_to_tag_dict` for several bundles, all resolved from
+    the same stats. The tags are grouped by extension, and chunks shared by
+    several bundles are only included the first time.
+
+    :param bundle_names: The names of the bundles
+    :param extensions: (optional) the extensions to include, in order
+    :param config: (optional) the name of the configuration
+    :return: a dict of URLs to formatted tags as strings
+    '''
+    started = time.perf_counter()
+    loader = get_loader(config)
+    result = OrderedDict[str, str]()
+    if type(loader).get_bundle is not WebpackLoader.get_bundle:
+        # Loaders that customize get_bundle may not use the stats at all
+        for extension in extensions:
+            for bundle_name in bundle_names:
+                tags = get_as_url_to_tag_dict(
+                    bundle_name, request, extension, config, suffix, attrs,
+                    is_preload)
+                for url, tag in tags.items():
+                    result.setdefault(url, tag)
+        return result
+
+    assets = loader._get_compiled_assets(', '.join(bundle_names))
+    all_cached = True
+    for extension in extensions:
+        for bundle_name in bundle_names:
+            compiled, cache_hit = _get_snapshot_tags(
+                loader, assets, bundle_name, extension, suffix, attrs,
+                is_preload)
+            all_cached = all_cached and cache_hit
+            compiled = [entry for entry in compiled if entry[0] not in result]
+            result.update(_render_tags(loader, compiled, request, attrs))
+    _send_bundle_rendered(
+        loader, ', '.join(bundle_names),
+        extensions[0] if len(extensions) == 1 else None, len(result),
+        all_cached, started)
+    return result
+
+
+def get_as_tags_many(
+        bundle_names, request=None, extensions=('css', 'js'),
+        config='DEFAULT', suffix='', attrs='', is_preload=False):
+    '''
+    Get a list of formatted <link> & <script> tags for the assets in the
+    named bundles, see `get_as_url_to_tag_dict_many`.
+
+    :param bundle_names: The names of the bundles
+    :param extensions: (optional) the extensions to include, in order
+    :param config: (optional) the name of the configuration
+    :return: a list of formatted tags as strings
+    '''
+    return list(get_as_url_to_tag_dict_many(
+        bundle_names, request, extensions, config, suffix, attrs,
+        is_preload).values())
+
+
+async def aget_as_url_to_tag_dict(
+    bundle_name, request: Optional[HttpRequest] = None, extension=None,
+    config='DEFAULT', suffix='', attrs='', is_preload=False
+) -> OrderedDict[str, str]:
+    '''Async version of `get_as_url_to_tag_dict`'''
+    started = time.perf_counter()
+    loader = get_loader(config)
+    compiled, cache_hit = await _aget_compiled_tags(
+        loader, bundle_name, extension, suffix, attrs, is_preload)
+    tags = _render_tags(loader, compiled, request, attrs)
+    _send_bundle_rendered(
+        loader, bundle_name, extension, len(tags), cache_hit, started)
+    return tags
+
+
+async def aget_as_tags(
+        bundle_name, request=None, extension=None, config='DEFAULT', suffix='',
+        attrs='', is_preload=False):
+    '''Async version of `get_as_tags`, for async views'''
+    tags = await aget_as_url_to_tag_dict(
+        bundle_name, request, extension, config, suffix, attrs, is_preload)
+    return list(tags.values())
+
+
+def _get_public_path(loader):
+    public_path = loader.get_assets().get('publicPath')
+    if not public_path or public_path == 'auto':
+        public_path = getattr(settings, 'STATIC_URL')
+    return public_path
+
+
 def get_static(asset_name, config='DEFAULT'):
     '''
     Equivalent to Django's 'static' look up but for webpack assets.
@@ -129,9 +453,7 @@ def get_static(asset_name, config='DEFAULT'):
     :param config: (optional) the name of the configuration
     :return: path to webpack asset as a string
     '''
-    public_path = get_loader(config).get_assets().get('publicPath')
-    if not public_path or public_path == 'auto':
-        public_path = getattr(settings, 'STATIC_URL')
+    public_path = _get_public_path(get_loader(config))
 
     return '{0}{1}'.format(public_path, asset_name)
 
@@ -151,3 +473,21 @@ def get_asset(source_filename, config='DEFAULT'):
         return None
 
     return get_static(asset['name'], config)
+
+
+def get_asset_urls(source_filenames, config='DEFAULT'):
+    '''
+    Same as `get_asset`, for several source filenames at once.
+
+    :param source_filenames: the source filenames of the assets
+    :param config: (optional) the name of the configuration
+    :return: a list with the path to each webpack asset, or None when not found
+    '''
+    loader = get_loader(config)
+    assets = loader.get_assets_by_source_filenames(source_filenames)
+    public_path = _get_public_path(loader)
+
+    return [
+        '{0}{1}'.format(public_path, asset['name']) if asset else None
+        for asset in assets
+    ]
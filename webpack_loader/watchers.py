@@ -0,0 +1,175 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Optional
+
+__all__ = (
+    'PollingStatsWatcher',
+    'InotifyStatsWatcher',
+    'get_stats_watcher',
+)
+
+# See inotify(7)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _get_signature(path: str) -> Optional[tuple]:
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+
+class PollingStatsWatcher:
+    '''
+    Watch a stats file by calling `stat()` on it every `poll_interval`.
+
+    A single daemon thread does the polling, so any number of threads can
+    wait for the file to change without touching the disk themselves.
+    '''
+
+    def __init__(self, path: str, poll_interval: float):
+        self.path = os.path.abspath(path)
+        self.poll_interval = poll_interval
+        self.generation = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def _ensure_running(self):
+        # Threads don't survive a fork, so restart in the child process
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._condition:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._start()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name='webpack-loader-stats-watcher',
+                daemon=True)
+            self._thread.start()
+
+    def _start(self):
+        'Prepare what the watching thread needs, in the current process.'
+
+    def _notify(self):
+        with self._condition:
+            self.generation += 1
+            self._condition.notify_all()
+
+    def _run(self):
+        signature = _get_signature(self.path)
+        while True:
+            time.sleep(self.poll_interval)
+            current = _get_signature(self.path)
+            if current != signature:
+                signature = current
+                self._notify()
+
+    def wait(self, generation: int, timeout: Optional[float]) -> int:
+        '''
+        Block until the stats file changed since `generation` or `timeout`
+        seconds passed, and return the current generation.
+        '''
+        self._ensure_running()
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+class InotifyStatsWatcher(PollingStatsWatcher):
+    '''
+    Watch a stats file with Linux inotify, waking waiters as soon as the
+    file is closed after writing or moved into place.
+
+    The directory is watched rather than the file, so that stats files
+    replaced by a rename are picked up too.
+    '''
+
+    _libc = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        if not sys.platform.startswith('linux'):
+            return False
+        if cls._libc is None:
+            try:
+                libc = ctypes.CDLL(
+                    ctypes.util.find_library('c') or 'libc.so.6',
+                    use_errno=True)
+                libc.inotify_init1
+                libc.inotify_add_watch
+            except (OSError, AttributeError):
+                return False
+            InotifyStatsWatcher._libc = libc
+        return True
+
+    def _start(self):
+        fd = getattr(self, '_fd', None)
+        if fd is not None:
+            os.close(fd)
+        self._fd = None
+        self._filename = os.fsencode(os.path.basename(self.path))
+        if not self.is_available():
+            return
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return
+        wd = self._libc.inotify_add_watch(
+            fd, os.fsencode(os.path.dirname(self.path)),
+            _IN_CLOSE_WRITE | _IN_MOVED_TO)
+        if wd < 0:
+            os.close(fd)
+            return
+        self._fd = fd
+
+    def _read_events(self, fd):
+        'Yield `(mask, name)` for every event waiting on `fd`.'
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            yield mask, name
+
+    def _run(self):
+        fd = self._fd
+        if fd is None:
+            # inotify could not be set up, e.g. the directory is missing
+            return super()._run()
+        while True:
+            select.select([fd], [], [])
+            changed = False
+            for mask, name in self._read_events(fd):
+                if mask & _IN_IGNORED:
+                    # The directory went away, keep watching by polling
+                    return super()._run()
+                if name == self._filename:
+                    changed = True
+            if changed:
+                self._notify()
+
+
+def get_stats_watcher(path: str, poll_interval: float) -> PollingStatsWatcher:
+    'Return an inotify watcher for `path` when possible, a polling one otherwise.'
+    if InotifyStatsWatcher.is_available():
+        return InotifyStatsWatcher(path, poll_interval)
+    return PollingStatsWatcher(path, poll_interval)